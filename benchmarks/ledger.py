@@ -0,0 +1,228 @@
+"""Benchmarks de las operaciones del ledger con ledgers sintéticos (sin Tkinter).
+
+    python -m benchmarks.ledger --tamanos 10000 100000 --salida resultados.json
+    python -m benchmarks.ledger --comparar anterior.json --salida actual.json
+
+Cada operación se mide con el núcleo (setup/nucleo.py), que es lo que
+ejecutan los métodos de la ventana: agregar_registro, borrar_registro,
+actualizar_estadisticas, actualizar_balance_total, actualizar_tabla,
+cargar_datos y guardar_datos. Todo corre en un directorio temporal, con
+tasas fijas y sin red.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from datetime import date, datetime
+
+from benchmarks.sintetico import MONEDAS, TASAS, escribir_json, generar
+
+TAMANOS = (10_000, 100_000, 1_000_000)
+# Una operación es una regresión si su mediana empeora más que esto
+UMBRAL_REGRESION = 1.25
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def preparar_directorio(directorio, cantidad, almacenamiento, semilla):
+    """Escribe config, tasas de cambio vigentes y el ledger sintético en el directorio actual"""
+    from setup.estado import ARCHIVO_DATOS
+
+    os.chdir(directorio)
+    for archivo in os.listdir(directorio):
+        if os.path.isdir(archivo):
+            shutil.rmtree(archivo)
+        else:
+            os.remove(archivo)
+    with open("config.json", "w") as f:
+        json.dump({"moneda_principal": "ARS", "balance_total": 0.0, "almacenamiento": almacenamiento}, f)
+    with open("exchange_rates.json", "w") as f:
+        # Tasas recién "descargadas": el conversor no intenta ir a la red
+        json.dump({"rates": TASAS, "last_update": datetime.now().isoformat()}, f)
+    # Los otros almacenamientos migran este datos.json la primera vez que se abren
+    escribir_json(ARCHIVO_DATOS, generar(cantidad, semilla=semilla))
+
+
+def percentil(ordenados, p):
+    posicion = (len(ordenados) - 1) * p / 100
+    bajo, alto = math.floor(posicion), math.ceil(posicion)
+    return ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * (posicion - bajo)
+
+
+def resumir(tiempos):
+    ordenados = sorted(tiempos)
+    return {
+        "min": ordenados[0] * 1000,
+        "p50": percentil(ordenados, 50) * 1000,
+        "p90": percentil(ordenados, 90) * 1000,
+        "p99": percentil(ordenados, 99) * 1000,
+        "max": ordenados[-1] * 1000,
+        "media": sum(ordenados) / len(ordenados) * 1000
+    }
+
+
+def medir(operacion, repeticiones):
+    """Tiempos de cada repetición y pico de memoria de una pasada extra con tracemalloc"""
+    tiempos = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        operacion(i)
+        tiempos.append(time.perf_counter() - inicio)
+    # La memoria se mide aparte: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    operacion(repeticiones)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return tiempos, pico
+
+
+def cerrar(registros):
+    """Cierra la conexión SQLite o el mapa del archivo binario, si el almacenamiento los tiene"""
+    if hasattr(registros, "conexion"):
+        registros.conexion.close()
+    elif hasattr(registros, "cerrar"):
+        registros.cerrar()
+
+
+def operaciones(tracker, repeticiones_io):
+    """Pares (nombre, función, repeticiones); cada función recibe el número de repetición"""
+    from setup.estadisticas import Estadisticas
+    from setup.estado import abrir_registros
+
+    hoy = date.today().isoformat()
+    agregadas = []
+
+    def agregar(i):
+        agregadas.append(tracker.agregar(hoy, 10.0 + i, MONEDAS[i % len(MONEDAS)]))
+
+    def borrar(i):
+        if agregadas:
+            tracker.borrar(agregadas.pop())
+
+    def tabla(i):
+        # Lo que hace actualizar_tabla antes de tocar el Treeview: el índice ordenado
+        orden = array("q", tracker.datos.claves_por_fecha())
+        orden.reverse()
+
+    return [
+        ("agregar_registro", agregar, None),
+        ("borrar_registro", borrar, None),
+        ("actualizar_estadisticas", lambda i: tracker.resumen(), None),
+        ("recalcular_estadisticas", lambda i: Estadisticas.desde(tracker.datos), repeticiones_io),
+        ("actualizar_balance_total", lambda i: tracker.balance(), None),
+        ("actualizar_tabla", tabla, repeticiones_io),
+        # Se mide abrir y cerrar: si no, las conexiones y los mapas se acumulan entre repeticiones
+        ("cargar_datos", lambda i: cerrar(abrir_registros(tracker.configuracion)), repeticiones_io),
+        ("guardar_datos", lambda i: tracker.datos.guardar(), repeticiones_io),
+    ]
+
+
+def ejecutar(tamanos, almacenamientos, repeticiones, repeticiones_io, semilla):
+    from setup.nucleo import Tracker
+
+    resultados = []
+    directorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-ledger-") as directorio:
+        for almacenamiento in almacenamientos:
+            for tamano in tamanos:
+                preparar_directorio(directorio, tamano, almacenamiento, semilla)
+                tracker = Tracker()
+                for nombre, operacion, veces in operaciones(tracker, repeticiones_io):
+                    veces = veces or repeticiones
+                    tiempos, pico = medir(operacion, veces)
+                    resultado = {
+                        "operacion": nombre,
+                        "almacenamiento": almacenamiento,
+                        "tamano": tamano,
+                        "repeticiones": veces,
+                        "ms": resumir(tiempos),
+                        "memoria_pico_kb": pico / 1024
+                    }
+                    resultados.append(resultado)
+                    print(
+                        f"{almacenamiento:<7} {tamano:>9} {nombre:<26} "
+                        f"p50 {resultado['ms']['p50']:10.3f} ms  p99 {resultado['ms']['p99']:10.3f} ms  "
+                        f"pico {resultado['memoria_pico_kb']:10.1f} KiB",
+                        flush=True
+                    )
+                cerrar(tracker.datos)
+                os.chdir(directorio_original)
+    return resultados
+
+
+def commit_actual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(anteriores, actuales):
+    """Imprime la relación de medianas con otra corrida; devuelve las regresiones encontradas"""
+    clave = lambda r: (r["operacion"], r["almacenamiento"], r["tamano"])
+    previos = {clave(r): r for r in anteriores["resultados"]}
+    regresiones = []
+    print(f"\nComparación con {anteriores.get('commit') or 'la corrida anterior'} (p50 actual / anterior):")
+    for resultado in actuales:
+        previo = previos.get(clave(resultado))
+        if previo is None or not previo["ms"]["p50"]:
+            continue
+        relacion = resultado["ms"]["p50"] / previo["ms"]["p50"]
+        marca = "  <-- regresión" if relacion > UMBRAL_REGRESION else ""
+        print(f"  {resultado['almacenamiento']:<7} {resultado['tamano']:>9} {resultado['operacion']:<26} x{relacion:6.2f}{marca}")
+        if marca:
+            regresiones.append(clave(resultado))
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las operaciones del ledger")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    parser.add_argument("--almacenamiento", nargs="+", choices=("json", "sqlite", "anual", "binario"), default=["json"])
+    parser.add_argument("--repeticiones", type=int, default=200, help="para las operaciones por registro")
+    parser.add_argument("--repeticiones-io", type=int, default=5, help="para cargar, guardar y recalcular")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo JSON con los resultados")
+    parser.add_argument("--comparar", help="resultados JSON de otra corrida para detectar regresiones")
+    opciones = parser.parse_args(argumentos)
+
+    # Los módulos del tracker se importan desde la raíz aunque se trabaje en un directorio temporal
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    resultados = ejecutar(
+        opciones.tamanos, opciones.almacenamiento,
+        opciones.repeticiones, opciones.repeticiones_io, opciones.semilla
+    )
+    informe = {
+        "commit": commit_actual(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "numpy": "numpy" in sys.modules,
+        "semilla": opciones.semilla,
+        "resultados": resultados
+    }
+    if opciones.salida:
+        with open(opciones.salida, "w") as f:
+            json.dump(informe, f, indent=2)
+
+    if opciones.comparar:
+        with open(opciones.comparar) as f:
+            if comparar(json.load(f), resultados):
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+"""Generador de ledgers sintéticos para pruebas de carga (sin Tkinter ni red).
+
+    python -m benchmarks.sintetico --registros 10000000 --formato sqlite --salida /tmp/carga
+    python -m benchmarks.sintetico --registros 50000 --desde 2020-01-01 --hasta 2024-12-31 \\
+        --monedas USD=0.2,ARS=0.7,EUR=0.1 --positivos 0.25 --dias-activos 0.6 --semilla 7
+
+Los registros tienen el mismo esquema que guarda `Tracker.agregar`
+(fecha, monto, moneda, monto_convertido, moneda_principal, estado) y
+salen en orden de fecha, como se cargarían día a día. Se escriben a
+medida que se generan, así que la memoria no depende de la cantidad.
+Con la misma semilla y los mismos parámetros el archivo es idéntico.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+from bisect import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+
+MONEDAS = ("USD", "ARS", "EUR")
+# Las mismas tasas de respaldo que usa el conversor (contra USD)
+TASAS = {"USD": 1.0, "ARS": 950.0, "EUR": 0.92}
+# Mezcla de monedas por defecto: (moneda, peso)
+MEZCLA_MONEDAS = (("USD", 0.3), ("ARS", 0.6), ("EUR", 0.1))
+# Montos en USD con cola pesada: escala * Pareto(alfa), recortado al máximo
+ESCALA_MONTO = 5.0
+ALFA_MONTO = 1.3
+MONTO_MAXIMO = 250_000.0
+# Cada cuántos registros se informa el avance
+INTERVALO_AVANCE = 1_000_000
+
+
+def parsear_mezcla(texto):
+    """'USD=0.3,ARS=0.6' -> [('USD', 0.3), ('ARS', 0.6)]"""
+    mezcla = []
+    for parte in texto.split(","):
+        moneda, _, peso = parte.partition("=")
+        try:
+            peso = float(peso) if peso else 1.0
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"peso inválido para {moneda}: {peso!r}")
+        if peso < 0:
+            raise argparse.ArgumentTypeError(f"peso negativo para {moneda}")
+        mezcla.append((moneda.strip().upper(), peso))
+    if not any(peso for _, peso in mezcla):
+        raise argparse.ArgumentTypeError("la mezcla de monedas necesita algún peso positivo")
+    return mezcla
+
+
+def _poisson(aleatorio, media):
+    """Cantidad de registros de un día con la media dada"""
+    if media < 30:
+        # Knuth: exacto y rápido para medias chicas
+        limite, cantidad, producto = math.exp(-media), 0, aleatorio.random()
+        while producto > limite:
+            cantidad += 1
+            producto *= aleatorio.random()
+        return cantidad
+    return max(0, round(aleatorio.gauss(media, math.sqrt(media))))
+
+
+def pesos_por_dia(aleatorio, desde, hasta, dias_activos, peso_fin_de_semana):
+    """Peso de actividad de cada día del rango (0 = día sin movimientos)"""
+    pesos = []
+    for ordinal in range(desde.toordinal(), hasta.toordinal() + 1):
+        if aleatorio.random() >= dias_activos:
+            pesos.append(0.0)
+        elif date.fromordinal(ordinal).weekday() >= 5:
+            pesos.append(peso_fin_de_semana)
+        else:
+            pesos.append(1.0)
+    if not any(pesos):
+        # Al menos un día activo para poder ubicar los registros
+        pesos[-1] = 1.0
+    return pesos
+
+
+def generar(cantidad, desde=None, hasta=None, mezcla=MEZCLA_MONEDAS, positivos=0.3,
+            dias_activos=0.8, peso_fin_de_semana=0.5, escala=ESCALA_MONTO, alfa=ALFA_MONTO,
+            moneda_principal="ARS", semilla=0):
+    """Genera `cantidad` registros ordenados por fecha entre `desde` y `hasta` (date).
+
+    Por defecto cubre los últimos tres años. Los registros se reparten entre
+    los días activos con una Poisson por día (los fines de semana pesan
+    `peso_fin_de_semana`); la suma siempre es exactamente `cantidad`.
+    """
+    hasta = hasta or date.today()
+    desde = desde or hasta - timedelta(days=3 * 365)
+    if desde > hasta:
+        raise ValueError("la fecha inicial es posterior a la final")
+    aleatorio = random.Random(semilla)
+    pesos = pesos_por_dia(aleatorio, desde, hasta, dias_activos, peso_fin_de_semana)
+
+    monedas = [moneda for moneda, _ in mezcla]
+    acumulados = list(accumulate(peso for _, peso in mezcla))
+    total_pesos = acumulados[-1]
+    tasa_principal = TASAS.get(moneda_principal, 1.0)
+    # Sin tasa conocida la moneda se genera como si valiera un dólar
+    tasas = [TASAS.get(moneda, 1.0) for moneda in monedas]
+
+    restantes = cantidad
+    peso_restante = sum(pesos)
+    ultimo_activo = max(i for i, peso in enumerate(pesos) if peso)
+    for desplazamiento, peso in enumerate(pesos):
+        if not peso or not restantes:
+            continue
+        if desplazamiento == ultimo_activo:
+            del_dia = restantes
+        else:
+            del_dia = min(restantes, _poisson(aleatorio, restantes * peso / peso_restante))
+        peso_restante -= peso
+        restantes -= del_dia
+        fecha = (desde + timedelta(days=desplazamiento)).isoformat()
+
+        for _ in range(del_dia):
+            i = bisect(acumulados, aleatorio.random() * total_pesos)
+            indice = min(i, len(monedas) - 1)
+            base = min(escala * aleatorio.paretovariate(alfa), MONTO_MAXIMO)
+            if aleatorio.random() >= positivos:
+                base = -base
+            monto = round(base * tasas[indice], 2)
+            yield {
+                "fecha": fecha,
+                "monto": monto,
+                "moneda": monedas[indice],
+                "monto_convertido": monto / tasas[indice] * tasa_principal,
+                "moneda_principal": moneda_principal,
+                "estado": "POSITIVO" if monto > 0 else "NEGATIVO" if monto < 0 else "NEUTRO"
+            }
+
+
+def con_avance(registros, archivo=None):
+    """Deja pasar los registros e imprime cada INTERVALO_AVANCE cuántos van"""
+    archivo = archivo or sys.stderr
+    cantidad = 0
+    for cantidad, registro in enumerate(registros, 1):
+        yield registro
+        if cantidad % INTERVALO_AVANCE == 0:
+            print(f"  {cantidad:,} registros", file=archivo, flush=True)
+
+
+def escribir_json(ruta, registros):
+    """Escribe un datos.json (lista JSON) registro por registro; devuelve la cantidad"""
+    cantidad = 0
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        archivo.write("[")
+        for registro in registros:
+            archivo.write(",\n" if cantidad else "\n")
+            archivo.write(json.dumps(registro))
+            cantidad += 1
+        archivo.write("\n]\n")
+    return cantidad
+
+
+def escribir_sqlite(ruta, registros):
+    """Escribe un datos.db con el esquema del backend SQLite en una sola transacción"""
+    from setup.almacen_sqlite import RegistrosSQLite
+
+    registros_db = RegistrosSQLite(ruta)
+    try:
+        return registros_db.agregar_varios(registros)
+    finally:
+        registros_db.conexion.close()
+
+
+def escribir_binario(ruta, registros):
+    """Escribe un datos.ledger de registros de ancho fijo"""
+    from setup.almacen_binario import RegistrosBinarios
+
+    registros_binarios = RegistrosBinarios(ruta)
+    try:
+        return registros_binarios.agregar_varios(registros)
+    finally:
+        registros_binarios.cerrar()
+
+
+def escritores():
+    """Formato -> (nombre del archivo de datos, función que lo escribe)"""
+    from setup.almacen_anual import escribir_particiones
+    from setup.estado import ARCHIVO_BINARIO, ARCHIVO_DATOS, ARCHIVO_SQLITE, DIRECTORIO_ANUAL
+
+    return {
+        "json": (ARCHIVO_DATOS, escribir_json),
+        "sqlite": (ARCHIVO_SQLITE, escribir_sqlite),
+        # Un directorio con un archivo por año y el manifiesto
+        "anual": (DIRECTORIO_ANUAL, escribir_particiones),
+        "binario": (ARCHIVO_BINARIO, escribir_binario),
+    }
+
+
+def escribir(directorio, formato, registros, moneda_principal="ARS"):
+    """Escribe el ledger en `directorio` con el formato pedido; devuelve (ruta, cantidad).
+
+    Se escribe a un temporal que reemplaza al final, y si no hay
+    config.json se crea uno que apunta a ese almacenamiento.
+    """
+    nombre, escritor = escritores()[formato]
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre)
+    temporal = ruta + ".tmp"
+    _borrar(temporal)
+    try:
+        cantidad = escritor(temporal, registros)
+    except BaseException:
+        _borrar(temporal)
+        raise
+    if os.path.isdir(ruta):
+        # os.replace no pisa un directorio con contenido
+        shutil.rmtree(ruta)
+    os.replace(temporal, ruta)
+
+    configuracion = os.path.join(directorio, "config.json")
+    if not os.path.exists(configuracion):
+        with open(configuracion, "w") as f:
+            json.dump({"moneda_principal": moneda_principal, "balance_total": 0.0,
+                       "almacenamiento": formato}, f, indent=2)
+    return ruta, cantidad
+
+
+def _borrar(ruta):
+    if os.path.isdir(ruta):
+        shutil.rmtree(ruta)
+    elif os.path.exists(ruta):
+        os.remove(ruta)
+
+
+def _fecha(texto):
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida (AAAA-MM-DD): {texto!r}")
+
+
+def _fraccion(texto):
+    valor = float(texto)
+    if not 0 <= valor <= 1:
+        raise argparse.ArgumentTypeError(f"tiene que estar entre 0 y 1: {texto}")
+    return valor
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Genera ledgers sintéticos reproducibles")
+    parser.add_argument("--registros", type=int, default=100_000)
+    parser.add_argument("--formato", choices=("json", "sqlite", "anual", "binario"), default="json")
+    parser.add_argument("--salida", default=".", help="directorio donde se escribe el archivo de datos")
+    parser.add_argument("--desde", type=_fecha, help="AAAA-MM-DD (por defecto, tres años antes de --hasta)")
+    parser.add_argument("--hasta", type=_fecha, help="AAAA-MM-DD (por defecto, hoy)")
+    parser.add_argument("--monedas", type=parsear_mezcla, default=list(MEZCLA_MONEDAS),
+                        help="mezcla MONEDA=peso separada por comas (por defecto USD=0.3,ARS=0.6,EUR=0.1)")
+    parser.add_argument("--positivos", type=_fraccion, default=0.3, help="proporción de ingresos")
+    parser.add_argument("--dias-activos", type=_fraccion, default=0.8, help="proporción de días con movimientos")
+    parser.add_argument("--peso-fin-de-semana", type=float, default=0.5,
+                        help="actividad de sábados y domingos relativa a un día hábil")
+    parser.add_argument("--escala", type=float, default=ESCALA_MONTO, help="monto mínimo en USD")
+    parser.add_argument("--alfa", type=float, default=ALFA_MONTO,
+                        help="forma de la cola de Pareto (menor = montos grandes más frecuentes)")
+    parser.add_argument("--moneda-principal", default="ARS")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sobrescribir", action="store_true", help="reemplaza un archivo de datos existente")
+    opciones = parser.parse_args(argumentos)
+
+    # Los módulos del tracker se importan desde la raíz aunque se ejecute desde otro directorio
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if raiz not in sys.path:
+        sys.path.insert(0, raiz)
+
+    nombre, _ = escritores()[opciones.formato]
+    if os.path.exists(os.path.join(opciones.salida, nombre)) and not opciones.sobrescribir:
+        print(f"Error: ya existe {os.path.join(opciones.salida, nombre)} (usar --sobrescribir)", file=sys.stderr)
+        return 1
+
+    try:
+        registros = generar(
+            opciones.registros, opciones.desde, opciones.hasta, opciones.monedas,
+            opciones.positivos, opciones.dias_activos, opciones.peso_fin_de_semana,
+            opciones.escala, opciones.alfa, opciones.moneda_principal.upper(), opciones.semilla
+        )
+        ruta, cantidad = escribir(opciones.salida, opciones.formato, con_avance(registros),
+                                  opciones.moneda_principal.upper())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Generados {cantidad} registros en {ruta}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,57 @@
+import argparse
+
+# Opciones de diagnóstico. Se leen antes del resto de los imports porque con
+# --startup-trace también se miden los imports
+parser_opciones = argparse.ArgumentParser(description="Tracker financiero personal")
+parser_opciones.add_argument("--startup-trace", action="store_true", help="muestra los tiempos de arranque")
+parser_opciones.add_argument("--perf-log", metavar="ARCHIVO", help="mide las operaciones y agrega un resumen al archivo al salir")
+OPCIONES = parser_opciones.parse_known_args()[0]
+
+from setup.arranque import TrazaArranque
+TRAZA_ARRANQUE = TrazaArranque(activa=OPCIONES.startup_trace)
+TRAZA_ARRANQUE.medir_imports()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-import json
 import os
 import calendar
+from array import array
 
 from setup.facade import configurar_app
+from setup.ui import crear_selector_moneda, configurar_tabla_virtual
+from setup import rendimiento
+from setup.rendimiento import medido
 #Definicion de constantes
 FUENTE = "Segoe UI"
+# Transacciones que se listan en el tooltip de un día del calendario
+TRANSACCIONES_TOOLTIP = 8
 
 class AplicacionFinanciera:
-    def __init__(self):
+    def __init__(self, traza=None):
         # configura la ventana, los colores y carga los datos 
-        configurar_app(self)
+        configurar_app(self, traza)
+
+    # Estado compartido con el núcleo sin interfaz (setup/nucleo.py)
+    @property
+    def configuracion(self):
+        return self.nucleo.configuracion
+
+    @property
+    def datos(self):
+        return self.nucleo.datos
+
+    @property
+    def estadisticas(self):
+        return self.nucleo.estadisticas
+
+    @property
+    def indice_calendario(self):
+        return self.nucleo.indice_calendario
+
+    @property
+    def converter(self):
+        return self.nucleo.converter
 
     def on_enter(self, event, widget, color):
         """Efecto hover para botones"""
@@ -36,39 +75,17 @@ class AplicacionFinanciera:
     
 
     #Manejo de registros
+    @medido("agregar_registro")
     def agregar_registro(self):
         """Agrega un nuevo registro con conversión automática"""
         try:
-            fecha = self.entrada_fecha.get()
-            monto = float(self.entrada_monto.get())
-            moneda = self.moneda_var.get()
-            
-            # Validar fecha
-            datetime.strptime(fecha, "%Y-%m-%d")
-            
-            # Obtener moneda principal
-            moneda_principal = self.configuracion.get("moneda_principal", "ARS")
-            
-            # Convertir a moneda principal
-            monto_convertido = self.converter.convert(monto, moneda, moneda_principal)
-            
-            if monto > 0:
-                estado = "POSITIVO"
-            elif monto < 0:
-                estado = "NEGATIVO"
-            else:
-                estado = "NEUTRO"
-            
-            registro = {
-                "fecha": fecha,
-                "monto": monto,
-                "moneda": moneda,
-                "monto_convertido": monto_convertido,
-                "moneda_principal": moneda_principal,
-                "estado": estado
-            }
-            
-            self.datos.append(registro)
+            # El núcleo valida la fecha, convierte a la moneda principal y actualiza los índices
+            clave = self.nucleo.agregar(
+                self.entrada_fecha.get(),
+                float(self.entrada_monto.get()),
+                self.moneda_var.get()
+            )
+            self.insertar_en_tabla(clave, self.datos[clave])
             self.aplicarCambios()
             
             # Limpiar campos
@@ -77,6 +94,7 @@ class AplicacionFinanciera:
         except ValueError as e:
             messagebox.showerror("Error", "❌ Por favor, ingresa datos válidos")
 
+    @medido("borrar_registro")
     def borrar_registro(self):
         """Borra el registro seleccionado"""
         seleccion = self.tabla.selection()
@@ -84,14 +102,332 @@ class AplicacionFinanciera:
             messagebox.showwarning("Advertencia", "⚠️ Por favor, selecciona un registro para borrar")
             return
         
-        indice = self.tabla.index(seleccion[0])
+        # El id de cada fila de la tabla es la clave del registro
+        clave = int(seleccion[0])
         
         confirmar = messagebox.askyesno("Confirmar", "¿Estás seguro de que deseas borrar este registro?")
         if confirmar:
-            del self.datos[indice]
+            # Quitar la fila antes de borrar: el índice de la tabla todavía la lee
+            self.quitar_de_tabla(clave, self.datos[clave])
+            self.nucleo.borrar(clave)
             self.aplicarCambios()
 
 
+    #Importación y exportación
+    def importar_archivo(self):
+        """Importa un extracto bancario CSV u OFX: un solo guardado y un solo refresco de la interfaz"""
+        from tkinter import filedialog
+        
+        ruta = filedialog.askopenfilename(
+            title="Importar extracto",
+            filetypes=[
+                ("Extractos bancarios", "*.csv *.ofx *.qfx"),
+                ("CSV", "*.csv"),
+                ("OFX", "*.ofx *.qfx"),
+                ("Todos los archivos", "*.*")
+            ]
+        )
+        if not ruta:
+            return
+        
+        # Ventana de progreso (se actualiza cada lote de filas leídas)
+        ventana_progreso = tk.Toplevel(self.ventana)
+        ventana_progreso.title("📥 Importando...")
+        ventana_progreso.configure(bg=self.color_fondo_secundario)
+        ventana_progreso.transient(self.ventana)
+        lbl_progreso = tk.Label(
+            ventana_progreso,
+            text=f"Leyendo {os.path.basename(ruta)}...",
+            font=(FUENTE, 10),
+            bg=self.color_fondo_secundario,
+            fg=self.color_texto
+        )
+        lbl_progreso.pack(padx=20, pady=(15, 5))
+        barra = ttk.Progressbar(ventana_progreso, length=300, maximum=100)
+        barra.pack(padx=20, pady=(0, 15))
+        
+        def progreso(leidos, total):
+            barra["value"] = 100 * leidos / total if total else 100
+            lbl_progreso.config(text=f"Leyendo {os.path.basename(ruta)}... {barra['value']:.0f}%")
+            ventana_progreso.update_idletasks()
+        
+        try:
+            cantidad, errores = self.nucleo.importar(
+                ruta,
+                moneda_por_defecto=self.moneda_var.get(),
+                progreso=progreso
+            )
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"❌ No se pudo importar el archivo:\n{e}")
+            return
+        finally:
+            ventana_progreso.destroy()
+        
+        if cantidad:
+            # El núcleo ya recalculó los índices: refrescar todas las vistas juntas
+            configurar_tabla_virtual(self)
+            self.refresco.marcar("tabla", "estadisticas", "balance")
+        
+        mensaje = f"✅ Se importaron {cantidad} registros"
+        if errores:
+            detalle = "\n".join(f"  Línea {numero}: {motivo}" for numero, motivo in errores[:5])
+            mensaje += f"\n\n⚠️ Se omitieron {len(errores)} filas inválidas:\n{detalle}"
+            if len(errores) > 5:
+                mensaje += "\n  ..."
+        messagebox.showinfo("Importación", mensaje)
+
+    def mostrar_exportacion(self):
+        """Ventana para exportar los registros a CSV o JSON Lines, con filtros de fecha y moneda"""
+        export_window = tk.Toplevel(self.ventana)
+        export_window.title("📤 Exportar registros")
+        export_window.configure(bg=self.color_fondo)
+        export_window.resizable(False, False)
+        export_window.transient(self.ventana)
+        export_window.grab_set()
+        
+        main_frame = tk.Frame(export_window, bg=self.color_fondo, padx=30, pady=25)
+        main_frame.pack(fill="both", expand=True)
+        
+        tk.Label(
+            main_frame,
+            text="📤 EXPORTAR REGISTROS",
+            font=(FUENTE, 14, "bold"),
+            fg=self.color_acento,
+            bg=self.color_fondo
+        ).grid(row=0, column=0, columnspan=2, pady=(0, 20))
+        
+        # Filtros (vacío = sin límite)
+        desde_var = tk.StringVar()
+        hasta_var = tk.StringVar()
+        moneda_var = tk.StringVar(value="Todas")
+        campos = [
+            ("📅 Desde (AAAA-MM-DD)", desde_var),
+            ("📅 Hasta (AAAA-MM-DD)", hasta_var)
+        ]
+        for fila, (texto, variable) in enumerate(campos, 1):
+            tk.Label(
+                main_frame,
+                text=texto,
+                font=(FUENTE, 10),
+                fg=self.color_texto_secundario,
+                bg=self.color_fondo
+            ).grid(row=fila, column=0, sticky="w", pady=5)
+            tk.Entry(
+                main_frame,
+                textvariable=variable,
+                font=(FUENTE, 10),
+                bg=self.color_fondo_terciario,
+                fg=self.color_texto,
+                insertbackground=self.color_texto,
+                relief="flat",
+                width=14
+            ).grid(row=fila, column=1, sticky="w", padx=(10, 0), pady=5)
+        
+        tk.Label(
+            main_frame,
+            text="💱 Moneda",
+            font=(FUENTE, 10),
+            fg=self.color_texto_secundario,
+            bg=self.color_fondo
+        ).grid(row=3, column=0, sticky="w", pady=5)
+        ttk.Combobox(
+            main_frame,
+            textvariable=moneda_var,
+            values=["Todas"] + self.converter.get_all_currencies(),
+            state="readonly",
+            width=12
+        ).grid(row=3, column=1, sticky="w", padx=(10, 0), pady=5)
+        
+        def exportar_registros():
+            try:
+                # Validar y normalizar las fechas que se hayan ingresado
+                desde, hasta = (
+                    datetime.strptime(variable.get().strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+                    if variable.get().strip() else None
+                    for variable in (desde_var, hasta_var)
+                )
+            except ValueError:
+                messagebox.showerror("Error", "❌ Las fechas deben tener el formato AAAA-MM-DD", parent=export_window)
+                return
+            
+            from tkinter import filedialog
+            
+            ruta = filedialog.asksaveasfilename(
+                parent=export_window,
+                title="Exportar registros",
+                defaultextension=".csv",
+                filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+            )
+            if not ruta:
+                return
+            
+            monedas = None if moneda_var.get() == "Todas" else [moneda_var.get()]
+            try:
+                cantidad = self.nucleo.exportar(ruta, desde=desde, hasta=hasta, monedas=monedas)
+            except OSError as e:
+                messagebox.showerror("Error", f"❌ No se pudo exportar:\n{e}", parent=export_window)
+                return
+            
+            messagebox.showinfo("Exportación", f"✅ Se exportaron {cantidad} registros", parent=export_window)
+            export_window.destroy()
+        
+        btn_exportar = tk.Button(
+            main_frame,
+            text="📤 EXPORTAR",
+            command=exportar_registros,
+            font=(FUENTE, 11, "bold"),
+            bg=self.color_boton_agregar,
+            fg="white",
+            relief="flat",
+            padx=20,
+            pady=8,
+            cursor="hand2"
+        )
+        btn_exportar.grid(row=4, column=0, columnspan=2, pady=(20, 0))
+        btn_exportar.bind("<Enter>", lambda e, b=btn_exportar: self.on_enter(e, b, self.color_boton_agregar))
+        btn_exportar.bind("<Leave>", lambda e, b=btn_exportar: self.on_leave(e, b, self.color_boton_agregar))
+
+    #Diagnóstico de rendimiento (ventana oculta: Ctrl+Shift+D)
+    def mostrar_diagnostico(self, event=None):
+        """Muestra p50/p95/máximo de las operaciones medidas, actualizado cada segundo"""
+        diag_window = tk.Toplevel(self.ventana)
+        diag_window.title("⏱️ Diagnóstico de rendimiento")
+        diag_window.geometry("620x420")
+        diag_window.configure(bg=self.color_fondo)
+        
+        main_frame = tk.Frame(diag_window, bg=self.color_fondo, padx=20, pady=15)
+        main_frame.pack(fill="both", expand=True)
+        
+        lbl_estado = tk.Label(
+            main_frame,
+            font=(FUENTE, 10),
+            fg=self.color_texto_secundario,
+            bg=self.color_fondo
+        )
+        lbl_estado.pack(anchor="w", pady=(0, 10))
+        
+        columnas = ("Operación", "Llamadas", "p50 ms", "p95 ms", "Máx ms")
+        tabla = ttk.Treeview(main_frame, columns=columnas, show="headings", height=12)
+        for columna in columnas:
+            tabla.heading(columna, text=columna)
+            tabla.column(columna, width=200 if columna == "Operación" else 90, anchor="w" if columna == "Operación" else "e")
+        tabla.pack(fill="both", expand=True)
+        
+        botones_frame = tk.Frame(main_frame, bg=self.color_fondo)
+        botones_frame.pack(fill="x", pady=(10, 0))
+        
+        def alternar():
+            if rendimiento.activo():
+                rendimiento.desactivar()
+            else:
+                rendimiento.activar()
+            refrescar(programar=False)
+        
+        btn_alternar = tk.Button(
+            botones_frame,
+            command=alternar,
+            font=(FUENTE, 10, "bold"),
+            bg=self.color_boton_neutral,
+            fg="white",
+            relief="flat",
+            padx=15,
+            pady=6,
+            cursor="hand2"
+        )
+        btn_alternar.pack(side="left")
+        
+        def refrescar(programar=True):
+            if not diag_window.winfo_exists():
+                return
+            medicion_activa = rendimiento.activo()
+            lbl_estado.config(text="🟢 Midiendo operaciones" if medicion_activa else "⚪ Medición desactivada (iniciar con --perf-log o activarla aquí)")
+            btn_alternar.config(text="⏸️ Desactivar medición" if medicion_activa else "▶️ Activar medición")
+            tabla.delete(*tabla.get_children())
+            for nombre, datos in rendimiento.resumen().items():
+                tabla.insert("", "end", values=(
+                    nombre,
+                    datos["llamadas"],
+                    f"{datos['p50']:.2f}",
+                    f"{datos['p95']:.2f}",
+                    f"{datos['max']:.2f}"
+                ))
+            if programar:
+                diag_window.after(1000, refrescar)
+        
+        refrescar()
+
+    def mostrar_memoria(self):
+        """Muestra la memoria de cada estructura y lo que creció desde una referencia"""
+        from setup.memoria import SeguimientoMemoria, formatear_crecimiento, informe
+        
+        # tracemalloc empieza con la primera apertura: solo ve lo asignado desde entonces
+        if self.seguimiento_memoria is None:
+            self.seguimiento_memoria = SeguimientoMemoria()
+        seguimiento = self.seguimiento_memoria
+        
+        mem_window = tk.Toplevel(self.ventana)
+        mem_window.title("🧠 Diagnóstico de memoria")
+        mem_window.geometry("760x520")
+        mem_window.configure(bg=self.color_fondo)
+        
+        main_frame = tk.Frame(mem_window, bg=self.color_fondo, padx=20, pady=15)
+        main_frame.pack(fill="both", expand=True)
+        
+        texto = tk.Text(main_frame, font=("Courier", 9), wrap="none", relief="flat")
+        texto.pack(fill="both", expand=True)
+        
+        def mostrar(contenido):
+            texto.config(state="normal")
+            texto.delete("1.0", "end")
+            texto.insert("1.0", contenido)
+            texto.config(state="disabled")
+        
+        def actualizar():
+            mostrar(informe(self.nucleo, self))
+        
+        def tomar_referencia():
+            seguimiento.tomar_referencia()
+            actualizar()
+            btn_comparar.config(state="normal")
+        
+        def comparar():
+            total, lineas = seguimiento.crecimiento()
+            mostrar(formatear_crecimiento(total, lineas, "Crecimiento desde la referencia"))
+        
+        botones_frame = tk.Frame(main_frame, bg=self.color_fondo)
+        botones_frame.pack(fill="x", pady=(10, 0))
+        
+        for etiqueta, comando in (("🔄 Actualizar", actualizar), ("📌 Tomar referencia", tomar_referencia)):
+            tk.Button(
+                botones_frame,
+                text=etiqueta,
+                command=comando,
+                font=(FUENTE, 10, "bold"),
+                bg=self.color_boton_neutral,
+                fg="white",
+                relief="flat",
+                padx=15,
+                pady=6,
+                cursor="hand2"
+            ).pack(side="left", padx=(0, 10))
+        
+        btn_comparar = tk.Button(
+            botones_frame,
+            text="📈 Comparar con la referencia",
+            command=comparar,
+            state="normal" if seguimiento.referencia is not None else "disabled",
+            font=(FUENTE, 10, "bold"),
+            bg=self.color_boton_neutral,
+            fg="white",
+            relief="flat",
+            padx=15,
+            pady=6,
+            cursor="hand2"
+        )
+        btn_comparar.pack(side="left")
+        
+        actualizar()
+
     #Panel de estadisticas (el que esta en la parte inferior)
     def crear_estadisticas(self):
         """Crea el panel de estadísticas"""
@@ -157,26 +493,15 @@ class AplicacionFinanciera:
         # Calcular estadísticas iniciales
         self.actualizar_estadisticas()
     
+    @medido("actualizar_estadisticas")
     def actualizar_estadisticas(self):
-        """Actualiza las estadísticas"""
-        if not self.datos:
-            total = 0
-            promedio = 0
-            dias = 0
-            balance = 0
-        else:
-            # Calcular total
-            total = sum(registro["monto"] for registro in self.datos)
-            
-            # Calcular promedio
-            promedio = total / len(self.datos)
-            
-            # Contar días únicos
-            fechas = set(registro["fecha"] for registro in self.datos)
-            dias = len(fechas)
-            
-            # Calcular balance (positivo/negativo)
-            balance = total
+        """Actualiza las estadísticas (leídas de los totales incrementales)"""
+        total = self.estadisticas.total
+        promedio = self.estadisticas.promedio
+        dias = self.estadisticas.dias
+        
+        # Calcular balance (positivo/negativo)
+        balance = total
         
         # Actualizar etiquetas con colores
         color_total = self.color_positivo if total >= 0 else self.color_negativo
@@ -195,9 +520,6 @@ class AplicacionFinanciera:
     def mostrar_calendario(self):
         """Muestra un calendario mensual con las ganancias por día"""
 
-        if not hasattr(self, 'tooltip_actual'):
-            self.tooltip_actual = None
-
         calendario_ventana = tk.Toplevel(self.ventana)
         calendario_ventana.title("📅 Calendario Mensual")
         calendario_ventana.geometry("900x650")
@@ -289,14 +611,6 @@ class AplicacionFinanciera:
         )
         frame_calendario.pack(fill="both", expand=True)
         
-        # Organizar datos por fecha
-        self.datos_por_fecha = {}
-        for registro in self.datos:
-            fecha = registro["fecha"]
-            if fecha not in self.datos_por_fecha:
-                self.datos_por_fecha[fecha] = []
-            self.datos_por_fecha[fecha].append(registro)
-        
         # Frame para los encabezados de días
         header_dias_frame = tk.Frame(frame_calendario, bg=self.color_fondo_secundario)
         header_dias_frame.pack(fill="x", padx=10, pady=(15, 5))
@@ -323,6 +637,10 @@ class AplicacionFinanciera:
         for i in range(7):
             grid_frame.columnconfigure(i, weight=1)
         
+        # Celdas de los días y tooltip: se crean una vez y se reutilizan en cada mes
+        grid_frame.tooltip = self.crear_tooltip_calendario(calendario_ventana)
+        grid_frame.celdas = self.crear_celdas_calendario(grid_frame)
+        
         # Mostrar el mes actual
         self.actualizar_calendario(grid_frame, btn_anterior, btn_siguiente)
         
@@ -365,12 +683,50 @@ class AplicacionFinanciera:
                 bg=self.color_fondo
             ).pack(side="left")
 
+    def crear_celdas_calendario(self, grid_frame):
+        """Crea una sola vez las 6x7 celdas del calendario; al cambiar de mes solo se reconfiguran"""
+        celdas = []
+        for fila in range(6):
+            grid_frame.rowconfigure(fila, weight=1)
+            for columna in range(7):
+                dia_frame = tk.Frame(
+                    grid_frame,
+                    relief="solid",
+                    borderwidth=1,
+                    highlightthickness=1,
+                    height=80
+                )
+                dia_frame.grid(row=fila, column=columna, sticky="nsew", padx=1, pady=1)
+                dia_frame.grid_propagate(False)
+                
+                # Número del día
+                lbl_numero = tk.Label(dia_frame, font=(FUENTE, 10, "bold"))
+                lbl_numero.pack(anchor="nw", padx=5, pady=5)
+                
+                # Etiqueta con el total (solo visible en días con datos)
+                lbl_total = tk.Label(dia_frame, font=(FUENTE, 9, "bold"))
+                
+                # Día que muestra la celda (lo usa el tooltip); None si no tiene datos
+                celda = {
+                    "frame": dia_frame,
+                    "numero": lbl_numero,
+                    "total": lbl_total,
+                    "fecha": None,
+                    "mes": None,
+                    "dia": None
+                }
+                
+                # Asignar eventos una sola vez: leen los datos actuales de la celda
+                for widget in (dia_frame, lbl_numero, lbl_total):
+                    widget.bind("<Enter>", lambda e, c=celda: self.mostrar_tooltip_celda(grid_frame.tooltip, c))
+                    widget.bind("<Leave>", lambda e: self.ocultar_tooltip(grid_frame.tooltip))
+                
+                celdas.append(celda)
+        return celdas
+
+    @medido("actualizar_calendario")
     def actualizar_calendario(self, grid_frame, btn_anterior, btn_siguiente):
         """Actualiza el calendario con el mes actual"""
-        # Limpiar el frame del calendario
-        for widget in grid_frame.winfo_children():
-            widget.destroy()
-        
         # Obtener el año y mes actual
         mes_texto = self.mes_calendario.get()
         ano_actual = datetime.now().year
@@ -393,80 +749,43 @@ class AplicacionFinanciera:
             ano = ano_actual
         
         # Obtener el primer día del mes y el número de días
-        import calendar
-        primer_dia_semana, num_dias = calendar.monthrange(ano, mes)
-        
-        # Ajustar primer_dia para que 0=Lunes (calendario usa 0=Lunes por defecto en Python)
         # calendar.monthrange devuelve: 0=Lunes, 1=Martes, ..., 6=Domingo
+        primer_dia_semana, num_dias = calendar.monthrange(ano, mes)
+        filas_usadas = (primer_dia_semana + num_dias + 6) // 7
         
-        # Llenar el calendario
-        fila = 0
-        columna = primer_dia_semana
-        
-        # Rellenar días vacíos al inicio del mes
-        for i in range(primer_dia_semana):
-            dia_vacio = tk.Frame(
-                grid_frame,
-                bg=self.color_fondo_secundario,
-                relief="flat",
-                height=80
-            )
-            dia_vacio.grid(row=fila, column=i, sticky="nsew", padx=1, pady=1)
-            grid_frame.rowconfigure(fila, weight=1)
-            grid_frame.columnconfigure(i, weight=1)
-        
-        # Organizar datos por fecha (asegurarnos de que esté actualizado)
-        self.datos_por_fecha = {}
-        for registro in self.datos:
-            fecha = registro["fecha"]
-            if fecha not in self.datos_por_fecha:
-                self.datos_por_fecha[fecha] = []
-            self.datos_por_fecha[fecha].append(registro)
-        
-        # Variable para almacenar tooltips
-        self.tooltips = {}
+        # Datos del mes mostrado, ya agrupados por día en el índice del calendario
+        datos_mes = self.indice_calendario.mes(ano, mes)
+        hoy = datetime.now()
         
-        # Crear los días del mes
-        for dia in range(1, num_dias + 1):
-            fecha_str = f"{ano}-{mes:02d}-{dia:02d}"
+        for i, celda in enumerate(grid_frame.celdas):
+            dia = i - primer_dia_semana + 1
+            
+            # Ocultar la sexta fila en los meses que ocupan cinco semanas
+            if i // 7 >= filas_usadas:
+                celda["frame"].grid_remove()
+                continue
+            celda["frame"].grid()
+            
+            if not 1 <= dia <= num_dias:
+                # Celda de relleno antes o después del mes
+                celda["frame"].config(bg=self.color_fondo_secundario, relief="flat", highlightthickness=0)
+                celda["numero"].config(text="", bg=self.color_fondo_secundario)
+                celda["total"].pack_forget()
+                celda["dia"] = None
+                continue
             
             # Determinar si es hoy
-            hoy = datetime.now()
             es_hoy = (hoy.year == ano and hoy.month == mes and hoy.day == dia)
-            
-            # Crear frame para el día
             bg_color = self.color_acento if es_hoy else self.color_fondo_terciario
             border_color = self.color_acento if es_hoy else self.color_borde
-            
-            dia_frame = tk.Frame(
-                grid_frame,
-                bg=bg_color,
-                relief="solid",
-                borderwidth=1,
-                highlightbackground=border_color,
-                highlightthickness=1
-            )
-            dia_frame.grid(row=fila, column=columna, sticky="nsew", padx=1, pady=1)
-            dia_frame.grid_propagate(False)
-            
-            # Configurar el grid para que se expanda
-            grid_frame.rowconfigure(fila, weight=1)
-            grid_frame.columnconfigure(columna, weight=1)
-            
-            # Número del día
             numero_color = "white" if es_hoy else self.color_texto
-            lbl_numero = tk.Label(
-                dia_frame,
-                text=str(dia),
-                font=(FUENTE, 10, "bold"),
-                bg=bg_color,
-                fg=numero_color
-            )
-            lbl_numero.pack(anchor="nw", padx=5, pady=5)
+            
+            celda["frame"].config(bg=bg_color, relief="solid", highlightthickness=1, highlightbackground=border_color)
+            celda["numero"].config(text=str(dia), bg=bg_color, fg=numero_color)
             
             # Mostrar ganancias si hay datos para este día
-            if fecha_str in self.datos_por_fecha:
-                total_dia = sum(r["monto"] for r in self.datos_por_fecha[fecha_str])
+            if dia in datos_mes.totales:
+                total_dia = datos_mes.totales[dia]
                 
                 # Determinar color y emoji
                 if total_dia > 0:
@@ -482,141 +801,131 @@ class AplicacionFinanciera:
                     emoji = "⚪"
                     texto = f"{emoji} 0"
                 
-                # Etiqueta con el total
-                lbl_total = tk.Label(
-                    dia_frame,
-                    text=texto,
-                    font=(FUENTE, 9, "bold"),
-                    fg=color,
-                    bg=bg_color
-                )
-                lbl_total.pack(fill="x", padx=5, pady=2)
-                
-                # Función para crear tooltip
-                def crear_tooltip(event, fecha=fecha_str, total=total_dia, widget=dia_frame):
-                    # Destruir tooltip existente si hay uno
-                    if hasattr(self, 'tooltip_actual') and self.tooltip_actual:
-                        try:
-                            self.tooltip_actual.destroy()
-                        except:
-                            pass
-                    
-                    # Crear nuevo tooltip
-                    tooltip = tk.Toplevel(widget.winfo_toplevel())
-                    tooltip.wm_overrideredirect(True)
-                    tooltip.wm_geometry(f"+{widget.winfo_rootx()+20}+{widget.winfo_rooty()+20}")
-                    
-                    frame_tooltip = tk.Frame(
-                        tooltip,
-                        bg=self.color_fondo_terciario,
-                        relief="solid",
-                        borderwidth=1
-                    )
-                    frame_tooltip.pack()
-                    
-                    # Título
-                    tk.Label(
-                        frame_tooltip,
-                        text=f"📅 {fecha}",
-                        font=(FUENTE, 10, "bold"),
-                        bg=self.color_fondo_terciario,
-                        fg=self.color_texto
-                    ).pack(padx=10, pady=(5, 0))
-                    
-                    # Total del día
-                    color_total = self.color_positivo if total > 0 else self.color_negativo if total < 0 else self.color_neutro
-                    tk.Label(
-                        frame_tooltip,
-                        text=f"Total: ${total:+.2f}",
-                        font=(FUENTE, 11, "bold"),
-                        bg=self.color_fondo_terciario,
-                        fg=color_total
-                    ).pack(padx=10, pady=(2, 5))
-                    
-                    # Separador
-                    tk.Frame(
-                        frame_tooltip,
-                        height=1,
-                        bg=self.color_borde
-                    ).pack(fill="x", padx=5, pady=2)
-                    
-                    # Detalles
-                    if fecha in self.datos_por_fecha:
-                        tk.Label(
-                            frame_tooltip,
-                            text="Transacciones:",
-                            font=(FUENTE, 9),
-                            bg=self.color_fondo_terciario,
-                            fg=self.color_texto_secundario
-                        ).pack(padx=10, pady=(5, 0))
-                        
-                        for r in self.datos_por_fecha[fecha]:
-                            color_trans = self.color_positivo if r["monto"] > 0 else self.color_negativo if r["monto"] < 0 else self.color_neutro
-                            tk.Label(
-                                frame_tooltip,
-                                text=f"  ${r['monto']:+.2f} {r['moneda']}",
-                                font=(FUENTE, 9),
-                                bg=self.color_fondo_terciario,
-                                fg=color_trans
-                            ).pack(anchor="w", padx=20, pady=1)
-                    
-                    # Guardar referencia al tooltip
-                    self.tooltip_actual = tooltip
-                    
-                    # Función para destruir tooltip
-                    def destruir_tooltip(event=None):
-                        if hasattr(self, 'tooltip_actual') and self.tooltip_actual:
-                            try:
-                                self.tooltip_actual.destroy()
-                                self.tooltip_actual = None
-                            except:
-                                pass
-                    
-                    # Configurar eventos para cerrar tooltip
-                    tooltip.bind("<Leave>", destruir_tooltip)
-                    frame_tooltip.bind("<Leave>", destruir_tooltip)
-                    
-                    # También cerrar después de 3 segundos por si acaso
-                    tooltip.after(3000, destruir_tooltip)
-                
-                # Función para ocultar tooltip
-                def ocultar_tooltip(event=None):
-                    if hasattr(self, 'tooltip_actual') and self.tooltip_actual:
-                        try:
-                            self.tooltip_actual.destroy()
-                            self.tooltip_actual = None
-                        except:
-                            pass
-                
-                # Asignar eventos al frame del día
-                dia_frame.bind("<Enter>", crear_tooltip)
-                dia_frame.bind("<Leave>", ocultar_tooltip)
-                lbl_numero.bind("<Enter>", crear_tooltip)
-                lbl_numero.bind("<Leave>", ocultar_tooltip)
-                if 'lbl_total' in locals():
-                    lbl_total.bind("<Enter>", crear_tooltip)
-                    lbl_total.bind("<Leave>", ocultar_tooltip)
-            
-            # Ajustar posición para el siguiente día
-            columna += 1
-            if columna > 6:
-                columna = 0
-                fila += 1
-        
-        # Rellenar días vacíos al final del mes
-        ultima_fila = fila
-        if columna < 7:
-            for i in range(columna, 7):
-                dia_vacio = tk.Frame(
-                    grid_frame,
-                    bg=self.color_fondo_secundario,
-                    relief="flat",
-                    height=80
-                )
-                dia_vacio.grid(row=ultima_fila, column=i, sticky="nsew", padx=1, pady=1)
-                grid_frame.rowconfigure(ultima_fila, weight=1)
-                grid_frame.columnconfigure(i, weight=1)
-    
+                celda["total"].config(text=texto, fg=color, bg=bg_color)
+                celda["total"].pack(fill="x", padx=5, pady=2)
+                celda["fecha"] = f"{ano}-{mes:02d}-{dia:02d}"
+                celda["mes"] = datos_mes
+                celda["dia"] = dia
+            else:
+                celda["total"].pack_forget()
+                celda["dia"] = None
+
+    def crear_tooltip_calendario(self, padre):
+        """Crea (oculta) la única ventana de tooltip del calendario; se rellena al pasar el mouse"""
+        ventana = tk.Toplevel(padre)
+        ventana.wm_overrideredirect(True)
+        ventana.withdraw()
+        
+        frame_tooltip = tk.Frame(
+            ventana,
+            bg=self.color_fondo_terciario,
+            relief="solid",
+            borderwidth=1
+        )
+        frame_tooltip.pack()
+        
+        # Título
+        lbl_titulo = tk.Label(
+            frame_tooltip,
+            font=(FUENTE, 10, "bold"),
+            bg=self.color_fondo_terciario,
+            fg=self.color_texto
+        )
+        lbl_titulo.pack(padx=10, pady=(5, 0))
+        
+        # Total del día
+        lbl_total = tk.Label(
+            frame_tooltip,
+            font=(FUENTE, 11, "bold"),
+            bg=self.color_fondo_terciario
+        )
+        lbl_total.pack(padx=10, pady=(2, 5))
+        
+        # Separador
+        tk.Frame(
+            frame_tooltip,
+            height=1,
+            bg=self.color_borde
+        ).pack(fill="x", padx=5, pady=2)
+        
+        # Detalles
+        tk.Label(
+            frame_tooltip,
+            text="Transacciones:",
+            font=(FUENTE, 9),
+            bg=self.color_fondo_terciario,
+            fg=self.color_texto_secundario
+        ).pack(padx=10, pady=(5, 0))
+        
+        # Filas fijas para las transacciones principales y una para "+k más"
+        filas = [
+            tk.Label(frame_tooltip, font=(FUENTE, 9), bg=self.color_fondo_terciario)
+            for _ in range(TRANSACCIONES_TOOLTIP)
+        ]
+        lbl_resto = tk.Label(
+            frame_tooltip,
+            font=(FUENTE, 9, "italic"),
+            bg=self.color_fondo_terciario,
+            fg=self.color_texto_secundario
+        )
+        
+        tooltip = {
+            "ventana": ventana,
+            "titulo": lbl_titulo,
+            "total": lbl_total,
+            "filas": filas,
+            "resto": lbl_resto,
+            "cierre": None
+        }
+        ventana.bind("<Leave>", lambda e: self.ocultar_tooltip(tooltip))
+        return tooltip
+
+    def mostrar_tooltip_celda(self, tooltip, celda):
+        """Reposiciona y rellena el tooltip con el resumen del día de una celda"""
+        if celda["dia"] is None:
+            return
+        
+        total = celda["mes"].totales.get(celda["dia"])
+        if total is None:
+            # Se borró el último registro del día con el calendario abierto
+            self.ocultar_tooltip(tooltip)
+            return
+        principales, restantes = celda["mes"].resumen(celda["dia"], TRANSACCIONES_TOOLTIP)
+        
+        color_total = self.color_positivo if total > 0 else self.color_negativo if total < 0 else self.color_neutro
+        tooltip["titulo"].config(text=f"📅 {celda['fecha']}")
+        tooltip["total"].config(text=f"Total: ${total:+.2f}", fg=color_total)
+        
+        # Volver a empaquetar solo las filas necesarias, en orden
+        for fila in tooltip["filas"]:
+            fila.pack_forget()
+        tooltip["resto"].pack_forget()
+        for fila, (_, monto, moneda) in zip(tooltip["filas"], principales):
+            color_trans = self.color_positivo if monto > 0 else self.color_negativo if monto < 0 else self.color_neutro
+            fila.config(text=f"  ${monto:+.2f} {moneda}", fg=color_trans)
+            fila.pack(anchor="w", padx=20, pady=1)
+        if restantes:
+            tooltip["resto"].config(text=f"  +{restantes} más")
+            tooltip["resto"].pack(anchor="w", padx=20, pady=(1, 5))
+        
+        widget = celda["frame"]
+        ventana = tooltip["ventana"]
+        ventana.wm_geometry(f"+{widget.winfo_rootx()+20}+{widget.winfo_rooty()+20}")
+        ventana.deiconify()
+        ventana.lift()
+        
+        # También ocultarlo después de 3 segundos por si acaso
+        if tooltip["cierre"] is not None:
+            ventana.after_cancel(tooltip["cierre"])
+        tooltip["cierre"] = ventana.after(3000, lambda: self.ocultar_tooltip(tooltip))
+
+    def ocultar_tooltip(self, tooltip):
+        """Oculta el tooltip del calendario sin destruirlo"""
+        if tooltip["cierre"] is not None:
+            tooltip["ventana"].after_cancel(tooltip["cierre"])
+            tooltip["cierre"] = None
+        tooltip["ventana"].withdraw()
+
     def cambiar_mes(self, grid_frame, btn_anterior, btn_siguiente, delta):
         """Cambia el mes en el calendario"""
         mes_texto = self.mes_calendario.get()
@@ -727,26 +1036,7 @@ class AplicacionFinanciera:
         balance_inicial = float(self.configuracion.get("balance_total", 0))
         
         # Calcular total de transacciones convertidas
-        total_transacciones = 0
-        for registro in self.datos:
-            monto = float(registro.get("monto", 0))
-            moneda_registro = registro.get("moneda", "USD")
-            
-            # Convertir si es necesario
-            if moneda_registro != moneda_actual:
-                if hasattr(self, 'converter'):
-                    monto_convertido = self.converter.convert(monto, moneda_registro, moneda_actual)
-                else:
-                    # Conversión simple si no hay converter
-                    tasas = {"USD": 1.0, "ARS": 950.0, "EUR": 0.92}
-                    if moneda_registro in tasas and moneda_actual in tasas:
-                        monto_convertido = monto * (tasas[moneda_actual] / tasas[moneda_registro])
-                    else:
-                        monto_convertido = monto
-            else:
-                monto_convertido = monto
-            
-            total_transacciones += monto_convertido
+        total_transacciones = self.calcular_total_transacciones(moneda_actual)
         
         # Balance total actual
         balance_total_actual = balance_inicial + total_transacciones
@@ -842,27 +1132,8 @@ class AplicacionFinanciera:
         moneda_frame = tk.Frame(new_frame, bg=self.color_fondo)
         moneda_frame.pack(anchor="w", fill="x", pady=(0, 20))
         
-        # Botones de radio para moneda
-        monedas = [("USD", "💵 USD"), ("ARS", "🇦🇷 ARS"), ("EUR", "💶 EUR")]
-        
-        for moneda, texto in monedas:
-            btn = tk.Radiobutton(
-                moneda_frame,
-                text=texto,
-                variable=moneda_principal_var,
-                value=moneda,
-                font=(FUENTE, 10),
-                fg=self.color_texto_secundario,
-                bg=self.color_fondo,
-                selectcolor=self.color_fondo,
-                activebackground=self.color_fondo,
-                activeforeground=self.color_acento,
-                indicatoron=0,
-                width=10,
-                relief="raised",
-                borderwidth=1
-            )
-            btn.pack(side="left", padx=(0, 10))
+        # Botones de radio para moneda (y desplegable con el resto)
+        crear_selector_moneda(self, moneda_frame, moneda_principal_var, self.color_fondo, ancho=10)
         
         # Nuevo balance inicial
         tk.Label(
@@ -934,21 +1205,13 @@ class AplicacionFinanciera:
                 nuevo_balance = float(nuevo_balance_str)
                 moneda_principal = moneda_principal_var.get()
                 
-                # Actualizar configuración
-                self.configuracion["moneda_principal"] = moneda_principal
-                self.configuracion["balance_total"] = nuevo_balance
-                
-                # Guardar en el archivo config.json
-                try:
-                    with open("config.json", "w") as f:
-                        json.dump(self.configuracion, f, indent=2)
-                except Exception as e:
-                    messagebox.showerror("Error", f"❌ Error guardando configuración: {str(e)}")
-                    return
+                # Actualizar y guardar la configuración (reconvierte los registros si cambió la moneda)
+                cambio_moneda = self.nucleo.configurar_balance(nuevo_balance, moneda_principal)
                 
-                # Actualizar la interfaz
-                self.actualizar_balance_total()
-                self.actualizar_tabla()
+                # Actualizar la interfaz (la tabla solo se rehace si cambió la moneda)
+                self.refresco.marcar("balance")
+                if cambio_moneda:
+                    self.refresco.marcar("tabla")
                 
                 messagebox.showinfo("Éxito", "✅ Balance inicial actualizado correctamente\n\nRecuerda: El balance total incluye este valor más todas tus transacciones.")
                 config_window.destroy()
@@ -1005,6 +1268,11 @@ class AplicacionFinanciera:
         # También permitir guardar con Enter
         nuevo_balance_entry.bind("<Return>", lambda e: guardar_cambios())
 
+    def calcular_total_transacciones(self, moneda_principal):
+        """Suma las transacciones en la moneda principal: una multiplicación por moneda"""
+        return self.nucleo.total_transacciones(moneda_principal)
+
+    @medido("actualizar_balance_total")
     def actualizar_balance_total(self):
         """Actualiza el display del balance total"""
         if not hasattr(self, 'lbl_balance_total'):
@@ -1013,35 +1281,9 @@ class AplicacionFinanciera:
         try:
             # Obtener configuración actual
             moneda_principal = self.configuracion.get("moneda_principal", "ARS")
-            balance_inicial = float(self.configuracion.get("balance_total", 0))
             
-            # Calcular total de transacciones convertidas a la moneda principal
-            total_transacciones = 0
-            for registro in self.datos:
-                monto = float(registro.get("monto", 0))
-                moneda_registro = registro.get("moneda", "USD")
-                
-                # Convertir si las monedas son diferentes
-                if moneda_registro != moneda_principal:
-                    # Usar el convertidor si está disponible
-                    if hasattr(self, 'converter'):
-                        monto_convertido = self.converter.convert(monto, moneda_registro, moneda_principal)
-                    else:
-                        # Conversión manual simple
-                        tasas = {"USD": 1.0, "ARS": 950.0, "EUR": 0.92}
-                        if moneda_registro in tasas and moneda_principal in tasas:
-                            # Convertir a USD primero, luego a la moneda destino
-                            monto_usd = monto / tasas[moneda_registro]
-                            monto_convertido = monto_usd * tasas[moneda_principal]
-                        else:
-                            monto_convertido = monto  # Si no conocemos la tasa
-                else:
-                    monto_convertido = monto
-                
-                total_transacciones += monto_convertido
-            
-            # Calcular balance total
-            balance_total = balance_inicial + total_transacciones
+            # Calcular balance total con las sumas por moneda
+            balance_total = self.nucleo.balance(moneda_principal)
             
             # Formatear el texto
             if balance_total >= 0:
@@ -1061,78 +1303,132 @@ class AplicacionFinanciera:
 
 
     # Refrescar tabla y guardar datos
+    @medido("actualizar_tabla")
     def actualizar_tabla(self):
-        """Actualiza la tabla con los datos actuales incluyendo conversiones"""
-        # Limpiar tabla
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
-        
-        # Ordenar datos por fecha (más reciente primero)
-        datos_ordenados = sorted(self.datos, key=lambda x: x["fecha"], reverse=True)
-        
+        """Reconstruye la tabla completa (al iniciar o al cambiar la moneda principal)"""
         # Obtener moneda principal
         moneda_principal = self.configuracion.get("moneda_principal", "ARS")
         
-        # Agregar datos a la tabla
-        for registro in datos_ordenados:
-            # Determinar color según el estado
-            tags = ()
-            if registro["monto"] > 0:
-                tags = ("positivo",)
-            elif registro["monto"] < 0:
-                tags = ("negativo",)
-            else:
-                tags = ("neutro",)
+        # Índice ordenado de las claves, de la fecha más antigua a la más reciente:
+        # permite ubicar altas y bajas con búsqueda binaria sin volver a ordenar todo
+        claves_por_fecha = array("q", self.datos.claves_por_fecha())
+        claves_por_fecha.reverse()
+        self.orden_tabla = claves_por_fecha
+        
+        if self.tabla_virtual:
+            # En modo virtual solo se materializan las filas visibles
+            self.tabla_virtual.refrescar()
+        else:
+            # Limpiar tabla
+            self.tabla.delete(*self.tabla.get_children())
             
-            # Calcular conversión si no existe
-            if "monto_convertido" not in registro:
-                registro["monto_convertido"] = self.converter.convert(
-                    registro["monto"], 
-                    registro["moneda"], 
-                    moneda_principal
+            # Agregar datos a la tabla, ordenados por fecha (más reciente primero)
+            for clave in reversed(self.orden_tabla):
+                registro = self.datos[clave]
+                self.tabla.insert(
+                    "",
+                    "end",
+                    iid=str(clave),
+                    values=self.valores_fila(registro, moneda_principal),
+                    tags=self.tags_fila(registro)
                 )
-            
-            self.tabla.insert(
-                "",
-                "end",
-                values=(
-                    registro["fecha"],
-                    f"${registro['monto']:+.2f}",
-                    registro["moneda"],
-                    f"${registro['monto_convertido']:+.2f} {moneda_principal}",
-                    registro["estado"]
-                ),
-                tags=tags
-            )
-        
-        # Configurar colores
-        self.tabla.tag_configure("positivo", foreground=self.color_positivo)
-        self.tabla.tag_configure("negativo", foreground=self.color_negativo)
-        self.tabla.tag_configure("neutro", foreground=self.color_neutro)
         
         # Actualizar balance total
-        self.actualizar_balance_total()
+        self.refresco.marcar("balance")
 
-    def aplicarCambios(self):
-        """Aplica los cambios: guarda datos, actualiza tabla y estadísticas"""
-        self.guardar_datos()
-        self.actualizar_tabla()
-        self.actualizar_estadisticas()
-        self.actualizar_balance_total()
+    def clave_orden_tabla(self, clave):
+        """Criterio del índice de la tabla: fecha y, a igual fecha, orden de carga"""
+        return (self.datos[clave]["fecha"], -clave)
 
-    def guardar_datos(self):
-        """Guarda los datos en el archivo JSON"""
-        with open("datos.json", "w") as archivo:
-            json.dump(self.datos, archivo, indent=2)
+    def posicion_en_tabla(self, objetivo, derecha=True):
+        """Búsqueda binaria en el índice de la tabla (bisect sin key, para Python 3.8)"""
+        bajo, alto = 0, len(self.orden_tabla)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            actual = self.clave_orden_tabla(self.orden_tabla[medio])
+            if actual < objetivo or (derecha and actual == objetivo):
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def insertar_en_tabla(self, clave, registro):
+        """Inserta una fila en su posición según la fecha, sin reconstruir la tabla"""
+        posicion = self.posicion_en_tabla((registro["fecha"], -clave))
+        self.orden_tabla.insert(posicion, clave)
+        
+        if self.tabla_virtual:
+            self.refresco.marcar("tabla_virtual")
+            return
         
-        # También guardar configuración
-        from setup.estado import guardar_configuracion
-        guardar_configuracion(self)
+        # La tabla muestra el índice al revés (más reciente primero)
+        moneda_principal = self.configuracion.get("moneda_principal", "ARS")
+        self.tabla.insert(
+            "",
+            len(self.orden_tabla) - 1 - posicion,
+            iid=str(clave),
+            values=self.valores_fila(registro, moneda_principal),
+            tags=self.tags_fila(registro)
+        )
+
+    def quitar_de_tabla(self, clave, registro):
+        """Quita la fila de un registro (antes de borrarlo del almacenamiento)"""
+        posicion = self.posicion_en_tabla((registro["fecha"], -clave), derecha=False)
+        if posicion < len(self.orden_tabla) and self.orden_tabla[posicion] == clave:
+            del self.orden_tabla[posicion]
+        
+        if self.tabla_virtual:
+            self.refresco.marcar("tabla_virtual")
+        else:
+            self.tabla.delete(str(clave))
+
+    def fila_tabla(self, posicion):
+        """Fila de la tabla virtual en una posición (0 = la más reciente)"""
+        clave = self.orden_tabla[len(self.orden_tabla) - 1 - posicion]
+        registro = self.datos[clave]
+        moneda_principal = self.configuracion.get("moneda_principal", "ARS")
+        return str(clave), self.valores_fila(registro, moneda_principal), self.tags_fila(registro)
+
+    def valores_fila(self, registro, moneda_principal):
+        """Valores de las columnas de la tabla para un registro"""
+        # Calcular conversión si no existe
+        monto_convertido = registro.get("monto_convertido")
+        if monto_convertido is None:
+            monto_convertido = self.converter.convert_at(
+                registro["monto"], 
+                registro["moneda"], 
+                moneda_principal,
+                registro["fecha"]
+            )
         
+        return (
+            registro["fecha"],
+            f"${registro['monto']:+.2f}",
+            registro["moneda"],
+            f"${monto_convertido:+.2f} {moneda_principal}",
+            registro["estado"]
+        )
+
+    def tags_fila(self, registro):
+        """Determina el color de la fila según el monto"""
+        if registro["monto"] > 0:
+            return ("positivo",)
+        elif registro["monto"] < 0:
+            return ("negativo",)
+        else:
+            return ("neutro",)
+
+    @medido("aplicarCambios")
+    def aplicarCambios(self):
+        """Marca estadísticas y balance para refrescarse en el próximo ciclo ocioso de Tk"""
+        self.refresco.marcar("estadisticas", "balance")
+
     def ejecutar(self):
         """Ejecuta la aplicación"""
         self.ventana.mainloop()
 
 if __name__ == "__main__":
-    app = AplicacionFinanciera()
+    if OPCIONES.perf_log:
+        rendimiento.activar(OPCIONES.perf_log)
+    app = AplicacionFinanciera(TRAZA_ARRANQUE)
     app.ejecutar()
\ No newline at end of file
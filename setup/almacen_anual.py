@@ -0,0 +1,333 @@
+import json
+import os
+import shutil
+from datetime import date
+from functools import lru_cache
+
+from setup.estado import (
+    UMBRAL_DIARIO_MINIMO, anotar_cambio, completar_guardado, escribir_snapshot, leer_datos_json, tamano_archivo
+)
+from setup.ledger import Ledger, fecha_a_ordinal
+from setup.rendimiento import medido
+
+ARCHIVO_MANIFIESTO = "manifiesto.json"
+# Años que se cargan al abrir: el actual y el anterior, para que la tabla
+# muestre movimientos recientes aunque el año recién empiece
+ANOS_INICIALES = 2
+
+
+def ruta_particion(directorio, ano):
+    return os.path.join(directorio, f"{ano}.json")
+
+
+def ruta_diario(directorio, ano):
+    return os.path.join(directorio, f"{ano}.diario.jsonl")
+
+
+@lru_cache(maxsize=4096)
+def _fecha_y_ano(fecha):
+    """Fecha normalizada a AAAA-MM-DD y su año"""
+    dia = date.fromordinal(fecha_a_ordinal(fecha))
+    return dia.isoformat(), dia.year
+
+
+def _ano_de(fecha):
+    return _fecha_y_ano(fecha)[1]
+
+
+def agregados_vacios():
+    return {"cantidad": 0, "total": 0.0, "por_fecha": {}, "sumas_por_moneda": {}}
+
+
+def sumar(agregados, registro):
+    """Suma un registro a los agregados de su año (lo que guarda el manifiesto)"""
+    fecha = _fecha_y_ano(registro["fecha"])[0]
+    monto = float(registro.get("monto", 0))
+    agregados["cantidad"] += 1
+    agregados["total"] += monto
+    # fecha -> [cantidad, suma de montos], lo mismo que da resumen_por_fecha
+    dia = agregados["por_fecha"].setdefault(fecha, [0, 0.0])
+    dia[0] += 1
+    dia[1] += monto
+    moneda = registro.get("moneda", "USD")
+    agregados["sumas_por_moneda"][moneda] = agregados["sumas_por_moneda"].get(moneda, 0.0) + monto
+
+
+def _firma(directorio, ano):
+    """Tamaño y modificación de los archivos de un año, para saber si el manifiesto sigue vigente"""
+    try:
+        estado = os.stat(ruta_particion(directorio, ano))
+        snapshot = [estado.st_size, estado.st_mtime_ns]
+    except FileNotFoundError:
+        snapshot = None
+    return {"snapshot": snapshot, "diario": tamano_archivo(ruta_diario(directorio, ano))}
+
+
+def leer_manifiesto(directorio):
+    """Año -> agregados; un manifiesto que falta o está dañado se reconstruye cargando los años"""
+    try:
+        with open(os.path.join(directorio, ARCHIVO_MANIFIESTO), "r") as archivo:
+            anos = json.load(archivo).get("anos", {})
+    except (FileNotFoundError, ValueError, AttributeError):
+        return {}
+    return {int(ano): agregados for ano, agregados in anos.items()}
+
+
+def escribir_manifiesto(directorio, manifiesto):
+    ruta = os.path.join(directorio, ARCHIVO_MANIFIESTO)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w") as archivo:
+        json.dump({"version": 1, "anos": {str(ano): manifiesto[ano] for ano in sorted(manifiesto)}}, archivo)
+    os.replace(temporal, ruta)
+
+
+def escribir_particiones(directorio, registros):
+    """Reparte los registros en un archivo por año y escribe el manifiesto; devuelve la cantidad.
+
+    Los registros (puede ser un generador, en cualquier orden) se escriben a
+    medida que llegan: queda abierto un archivo por año, no una lista con todo.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    archivos = {}
+    manifiesto = {}
+    cantidad = 0
+    try:
+        for registro in registros:
+            ano = _ano_de(registro["fecha"])
+            archivo = archivos.get(ano)
+            if archivo is None:
+                archivo = archivos[ano] = open(ruta_particion(directorio, ano), "w", encoding="utf-8")
+                archivo.write("[\n")
+                manifiesto[ano] = agregados_vacios()
+            else:
+                archivo.write(",\n")
+            archivo.write(json.dumps(registro))
+            sumar(manifiesto[ano], registro)
+            cantidad += 1
+    finally:
+        for archivo in archivos.values():
+            archivo.write("\n]\n")
+            archivo.close()
+
+    for ano, agregados in manifiesto.items():
+        agregados.update(_firma(directorio, ano))
+    escribir_manifiesto(directorio, manifiesto)
+    return cantidad
+
+
+def abrir_anual(directorio):
+    """Abre el almacenamiento por año; la primera vez reparte los datos de datos.json"""
+    if not os.path.isdir(directorio):
+        migrar_desde_json(directorio)
+    return RegistrosAnuales(directorio)
+
+
+def migrar_desde_json(directorio):
+    """Reparte el snapshot JSON (más su diario) en un archivo por año"""
+    temporal = directorio + ".tmp"
+    if os.path.isdir(temporal):
+        shutil.rmtree(temporal)
+    cantidad = escribir_particiones(temporal, leer_datos_json())
+    os.replace(temporal, directorio)
+    if cantidad:
+        print(f"Migrados {cantidad} registros de datos.json a {directorio}/ (un archivo por año)")
+
+
+class RegistrosAnuales:
+    """Registros repartidos en un archivo por año, que se cargan recién cuando se piden.
+
+    Al abrir solo se leen los años recientes; del resto se usan los agregados
+    del manifiesto (cantidad y suma por día, suma por moneda), así las
+    estadísticas y el balance cubren todo el historial sin leerlo. Un año
+    viejo se carga la primera vez que se pide un rango de fechas que lo
+    incluye (el calendario al retroceder, una exportación filtrada) o al
+    recorrer todos los registros. Los años cargados comparten un Ledger, así
+    que las claves no cambian mientras dure la sesión; la tabla
+    (`claves_por_fecha`) muestra solo los años cargados.
+
+    Cada año tiene su snapshot (datos/2025.json) y su diario de cambios
+    (datos/2025.diario.jsonl). El manifiesto se reescribe al compactar un
+    año; si al abrir no coincide con los archivos de un año (quedaron
+    cambios en su diario), ese año se carga y sus totales salen del Ledger.
+    """
+
+    def __init__(self, directorio, anos_iniciales=ANOS_INICIALES):
+        self.directorio = directorio
+        self.ledger = Ledger()
+        self.cargados = set()
+        # Se llama con el año cada vez que se carga uno que tenía registros
+        self.al_cargar_ano = None
+        anos_en_disco = self._anos_en_disco()
+        # Un guardado cortado a mitad se completa antes de comparar con el manifiesto
+        for ano in anos_en_disco:
+            completar_guardado(ruta_particion(directorio, ano), ruta_diario(directorio, ano))
+        self.manifiesto = leer_manifiesto(directorio)
+        self.anos = set(self.manifiesto) | anos_en_disco
+
+        ano_actual = date.today().year
+        for ano in sorted(self.anos):
+            if ano > ano_actual - anos_iniciales or not self._manifiesto_vigente(ano):
+                self.cargar_ano(ano)
+
+    def _anos_en_disco(self):
+        anos = set()
+        for nombre in os.listdir(self.directorio):
+            prefijo = nombre.split(".", 1)[0]
+            if prefijo.isdigit() and nombre.endswith((".json", ".diario.jsonl", ".diario.jsonl.aplicado")):
+                anos.add(int(prefijo))
+        return anos
+
+    def _manifiesto_vigente(self, ano):
+        agregados = self.manifiesto.get(ano)
+        if agregados is None:
+            return False
+        firma = _firma(self.directorio, ano)
+        return agregados.get("snapshot") == firma["snapshot"] and agregados.get("diario") == firma["diario"]
+
+    # Carga a pedido
+    def cargar_ano(self, ano):
+        """Lee el snapshot y el diario de un año al Ledger, si todavía no se cargó"""
+        if ano in self.cargados:
+            return
+        self.cargados.add(ano)
+        self.anos.add(ano)
+        ruta, diario = ruta_particion(self.directorio, ano), ruta_diario(self.directorio, ano)
+        if os.path.exists(ruta) or os.path.exists(diario):
+            if self.ledger.agregar_varios(leer_datos_json(ruta, diario)) and self.al_cargar_ano is not None:
+                self.al_cargar_ano(ano)
+
+    def cargar_todos(self):
+        for ano in sorted(self.anos - self.cargados):
+            self.cargar_ano(ano)
+
+    def anos_sin_cargar(self):
+        return sorted(self.anos - self.cargados)
+
+    def _cargar_rango(self, desde, hasta):
+        ano_desde, ano_hasta = _ano_de(desde), _ano_de(hasta)
+        for ano in self.anos_sin_cargar():
+            if ano_desde <= ano <= ano_hasta:
+                self.cargar_ano(ano)
+
+    def _agregados_sin_cargar(self):
+        # Un año sin cargar siempre tiene su entrada vigente en el manifiesto
+        for ano in self.anos_sin_cargar():
+            yield self.manifiesto[ano]
+
+    # Interfaz común con RegistrosJSON y RegistrosSQLite
+    def __len__(self):
+        return len(self.ledger) + sum(agregados["cantidad"] for agregados in self._agregados_sin_cargar())
+
+    def __iter__(self):
+        self.cargar_todos()
+        return iter(self.ledger)
+
+    def __getitem__(self, clave):
+        return self.ledger[clave]
+
+    def items(self):
+        self.cargar_todos()
+        return self.ledger.items()
+
+    def agregar(self, registro):
+        """Agrega un registro y lo anota en el diario de su año"""
+        # El año tiene que estar cargado: al compactarlo se escribe lo que hay en el Ledger
+        ano = _ano_de(registro["fecha"])
+        self.cargar_ano(ano)
+        clave = self.ledger.agregar(registro)
+        self._registrar_cambio(ano, "alta", self.ledger[clave].a_dict())
+        return clave
+
+    def agregar_varios(self, registros):
+        """Agrega muchos registros y guarda un snapshot de cada año que cambió"""
+        cargados, anos = set(self.cargados), set(self.anos)
+        tocados = set()
+        cantidad = 0
+
+        def con_ano_cargado():
+            nonlocal cantidad
+            for registro in registros:
+                ano = _ano_de(registro["fecha"])
+                if ano not in tocados:
+                    tocados.add(ano)
+                    self.cargar_ano(ano)
+                cantidad += 1
+                yield registro
+
+        try:
+            # Lo que devuelve el Ledger incluiría las filas de los años cargados en el camino
+            self.ledger.agregar_varios(con_ano_cargado())
+        except Exception:
+            # El Ledger descarta también las filas de los años cargados durante el lote
+            self.cargados, self.anos = cargados, anos
+            raise
+        if cantidad:
+            for ano in sorted(tocados):
+                self.guardar_ano(ano, con_manifiesto=False)
+            escribir_manifiesto(self.directorio, self.manifiesto)
+        return cantidad
+
+    def borrar(self, clave):
+        """Borra un registro por clave y anota la baja en el diario de su año"""
+        registro = self.ledger.borrar(clave)
+        self._registrar_cambio(_ano_de(registro["fecha"]), "baja", registro)
+        return registro
+
+    def reconvertir(self, converter, moneda_principal):
+        """Reconvierte todos los registros: carga todos los años y los vuelve a guardar"""
+        self.cargar_todos()
+        self.ledger.reconvertir(converter, moneda_principal)
+        self.guardar()
+
+    @medido("RegistrosAnuales._registrar_cambio")
+    def _registrar_cambio(self, ano, operacion, registro):
+        tamano_diario = anotar_cambio(ruta_diario(self.directorio, ano), operacion, registro)
+        if tamano_diario > max(UMBRAL_DIARIO_MINIMO, tamano_archivo(ruta_particion(self.directorio, ano)) // 2):
+            self.guardar_ano(ano)
+
+    @medido("RegistrosAnuales.guardar_ano")
+    def guardar_ano(self, ano, con_manifiesto=True):
+        """Escribe el snapshot de un año cargado, vacía su diario y actualiza el manifiesto"""
+        agregados = agregados_vacios()
+        registros = []
+        for _, registro in self.ledger.items_entre(f"{ano:04d}-01-01", f"{ano:04d}-12-31"):
+            registro = registro.a_dict()
+            registros.append(registro)
+            sumar(agregados, registro)
+
+        escribir_snapshot(ruta_particion(self.directorio, ano), ruta_diario(self.directorio, ano), registros)
+
+        agregados.update(_firma(self.directorio, ano))
+        self.manifiesto[ano] = agregados
+        if con_manifiesto:
+            escribir_manifiesto(self.directorio, self.manifiesto)
+
+    def guardar(self):
+        """Escribe el snapshot de cada año cargado y el manifiesto"""
+        for ano in sorted(self.cargados):
+            self.guardar_ano(ano, con_manifiesto=False)
+        escribir_manifiesto(self.directorio, self.manifiesto)
+
+    # Consultas
+    def claves_por_fecha(self):
+        """Claves de los años cargados, del registro más reciente al más antiguo"""
+        return self.ledger.claves_por_fecha()
+
+    def sumas_por_moneda(self):
+        sumas = dict(self.ledger.sumas_por_moneda())
+        for agregados in self._agregados_sin_cargar():
+            for moneda, suma in agregados["sumas_por_moneda"].items():
+                sumas[moneda] = sumas.get(moneda, 0.0) + suma
+        return sumas
+
+    def resumen_por_fecha(self):
+        """Genera (fecha, cantidad, suma de montos) por día, de los años cargados y del manifiesto"""
+        yield from self.ledger.resumen_por_fecha()
+        for agregados in self._agregados_sin_cargar():
+            for fecha, (cantidad, suma) in agregados["por_fecha"].items():
+                yield fecha, cantidad, suma
+
+    def items_entre(self, desde, hasta):
+        """Pares (clave, registro) entre desde y hasta, cargando los años de ese rango"""
+        self._cargar_rango(desde, hasta)
+        return self.ledger.items_entre(desde, hasta)
@@ -0,0 +1,417 @@
+import json
+import math
+import mmap
+import os
+import struct
+
+from setup.ledger import FECHA_BORRADA, TAMANO_TROZO, Codigos, RegistroVista, fecha_a_ordinal, ordinal_a_fecha
+
+# NumPy es opcional: con NumPy las consultas leen el archivo mapeado sin
+# copiarlo; sin NumPy se desempaqueta registro por registro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIA = b"LEDGERB1"
+VERSION = 1
+# magia, versión, tamaño de registro, registros usados (con huecos), huecos, largo de la tabla de códigos
+CABECERA = struct.Struct("<8sIIQQI")
+# La tabla de códigos (JSON) va después de la cabecera; los registros empiezan alineados a página
+INICIO_CODIGOS = 64
+INICIO_REGISTROS = 4096
+# monto, monto_convertido (NaN = sin convertir), fecha (ordinal de día), moneda, moneda principal, estado
+REGISTRO = struct.Struct("<ddiBBBx")
+CAPACIDAD_INICIAL = 1024
+
+if np is not None:
+    DTYPE = np.dtype({
+        "names": ["monto", "monto_convertido", "fecha", "moneda", "moneda_principal", "estado"],
+        "formats": ["<f8", "<f8", "<i4", "u1", "u1", "u1"],
+        "offsets": [0, 8, 16, 20, 21, 22],
+        "itemsize": REGISTRO.size
+    })
+
+
+def abrir_binario(ruta):
+    """Abre el archivo binario; la primera vez convierte los datos de datos.json"""
+    from setup.estado import ARCHIVO_DATOS
+
+    if not os.path.exists(ruta) and os.path.exists(ARCHIVO_DATOS):
+        cantidad = json_a_binario(ARCHIVO_DATOS, ruta)
+        print(f"Migrados {cantidad} registros de datos.json a {ruta}")
+    return RegistrosBinarios(ruta)
+
+
+def json_a_binario(origen, destino):
+    """Convierte un snapshot JSON (más su diario) al formato binario; devuelve la cantidad"""
+    from setup.estado import leer_datos_json
+
+    diario = os.path.splitext(origen)[0] + ".diario.jsonl"
+    temporal = destino + ".tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+    registros = RegistrosBinarios(temporal)
+    try:
+        cantidad = registros.agregar_varios(leer_datos_json(origen, diario))
+    finally:
+        registros.cerrar()
+    os.replace(temporal, destino)
+    return cantidad
+
+
+def binario_a_json(origen, destino):
+    """Escribe los registros de un archivo binario como lista JSON, uno por uno; devuelve la cantidad"""
+    registros = RegistrosBinarios(origen)
+    temporal = destino + ".tmp"
+    cantidad = 0
+    try:
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write("[")
+            for registro in registros:
+                archivo.write(",\n" if cantidad else "\n")
+                archivo.write(json.dumps(registro.a_dict()))
+                cantidad += 1
+            archivo.write("\n]\n")
+    finally:
+        registros.cerrar()
+    os.replace(temporal, destino)
+    return cantidad
+
+
+class RegistrosBinarios:
+    """Registros en un archivo binario de ancho fijo, leído con mmap en lugar de cargarlo.
+
+    Cada registro ocupa 24 bytes: monto y monto convertido en float64, la
+    fecha como ordinal de día en int32 y moneda, moneda principal y estado
+    como códigos de 1 byte (los nombres están en la tabla de códigos de la
+    cabecera). Abrir solo lee la cabecera; con NumPy los totales, las sumas
+    por día y los rangos de fechas se calculan sobre una vista `frombuffer`
+    del mapa, sin copiar, y el sistema operativo mantiene en caché las
+    páginas leídas. Un alta escribe 24 bytes al final y una baja deja un
+    hueco con fecha 0 y montos en 0, como en el Ledger: las sumas no
+    necesitan máscara y las claves (la posición) no cambian en la sesión.
+    Los huecos se quitan solo a pedido (`compactar`), porque cambia las claves.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.codigos_moneda = Codigos()
+        self.codigos_estado = Codigos()
+        nuevo = not os.path.exists(ruta)
+        self.archivo = open(ruta, "w+b" if nuevo else "r+b")
+        if nuevo:
+            self.usados = self.borrados = 0
+            self.archivo.truncate(INICIO_REGISTROS + CAPACIDAD_INICIAL * REGISTRO.size)
+            self._mapear()
+            self._escribir_codigos()
+        else:
+            self._mapear()
+            self._leer_cabecera()
+
+    # Archivo
+    def _mapear(self):
+        self.mapa = mmap.mmap(self.archivo.fileno(), 0)
+        self.capacidad = (len(self.mapa) - INICIO_REGISTROS) // REGISTRO.size
+
+    def _leer_cabecera(self):
+        magia, version, tamano_registro, self.usados, self.borrados, largo_codigos = CABECERA.unpack_from(self.mapa, 0)
+        if magia != MAGIA or tamano_registro != REGISTRO.size:
+            raise ValueError(f"{self.ruta} no es un archivo de registros binario")
+        if version > VERSION:
+            raise ValueError(f"{self.ruta} tiene una versión más nueva ({version}) del formato binario")
+        codigos = json.loads(self.mapa[INICIO_CODIGOS:INICIO_CODIGOS + largo_codigos])
+        for moneda in codigos["monedas"]:
+            self.codigos_moneda.codigo(moneda)
+        for estado in codigos["estados"]:
+            self.codigos_estado.codigo(estado)
+
+    def _escribir_cabecera(self, largo_codigos=None):
+        if largo_codigos is None:
+            largo_codigos = CABECERA.unpack_from(self.mapa, 0)[5]
+        CABECERA.pack_into(self.mapa, 0, MAGIA, VERSION, REGISTRO.size, self.usados, self.borrados, largo_codigos)
+
+    def _escribir_codigos(self):
+        codigos = json.dumps({
+            "monedas": self.codigos_moneda.valores,
+            "estados": self.codigos_estado.valores
+        }).encode("utf-8")
+        if INICIO_CODIGOS + len(codigos) > INICIO_REGISTROS:
+            raise ValueError("La tabla de códigos no entra en la cabecera del archivo binario")
+        self.mapa[INICIO_CODIGOS:INICIO_CODIGOS + len(codigos)] = codigos
+        self._escribir_cabecera(len(codigos))
+
+    def _crecer(self):
+        """Duplica la capacidad del archivo y lo vuelve a mapear"""
+        self.mapa.close()
+        self.archivo.truncate(INICIO_REGISTROS + max(CAPACIDAD_INICIAL, self.capacidad * 2) * REGISTRO.size)
+        self._mapear()
+
+    def compactar(self):
+        """Quita los huecos copiando los registros vivos a un temporal que reemplaza al archivo.
+
+        Cambia las claves. Si el proceso se corta a mitad de la copia, el
+        archivo original queda intacto (como en json_a_binario).
+        """
+        if not self.borrados:
+            return
+        temporal = self.ruta + ".tmp"
+        vivos = len(self)
+        cabecera = bytearray(self.mapa[:INICIO_REGISTROS])
+        CABECERA.pack_into(cabecera, 0, MAGIA, VERSION, REGISTRO.size, vivos, 0, CABECERA.unpack_from(self.mapa, 0)[5])
+        with open(temporal, "wb") as destino:
+            destino.write(cabecera)
+            for inicio in range(0, self.usados, TAMANO_TROZO):
+                destino.write(self._vivos_en_trozo(inicio))
+            destino.truncate(INICIO_REGISTROS + max(CAPACIDAD_INICIAL, vivos) * REGISTRO.size)
+            destino.flush()
+            os.fsync(destino.fileno())
+        self.cerrar()
+        os.replace(temporal, self.ruta)
+        self.archivo = open(self.ruta, "r+b")
+        self._mapear()
+        self._leer_cabecera()
+
+    def _vivos_en_trozo(self, inicio):
+        """Bytes de los registros vivos entre inicio e inicio + TAMANO_TROZO"""
+        if np is not None:
+            trozo = self._vista_trozo(inicio)
+            return trozo[trozo["fecha"] != FECHA_BORRADA].tobytes()
+        return b"".join(REGISTRO.pack(*fila) for fila in self._filas_trozo(inicio) if fila[2] != FECHA_BORRADA)
+
+    def cerrar(self):
+        self.mapa.flush()
+        self.mapa.close()
+        self.archivo.close()
+
+    def _vista(self):
+        """Los registros usados como array estructurado de NumPy sobre el mapa (sin copia)"""
+        return np.frombuffer(self.mapa, dtype=DTYPE, count=self.usados, offset=INICIO_REGISTROS)
+
+    def _filas(self):
+        """Tuplas (monto, monto_convertido, fecha, moneda, moneda_principal, estado), sin NumPy"""
+        fin = INICIO_REGISTROS + self.usados * REGISTRO.size
+        return list(REGISTRO.iter_unpack(self.mapa[INICIO_REGISTROS:fin]))
+
+    def _vista_trozo(self, inicio):
+        """Como _vista, pero solo los registros entre inicio e inicio + TAMANO_TROZO"""
+        cantidad = min(TAMANO_TROZO, self.usados - inicio)
+        return np.frombuffer(self.mapa, dtype=DTYPE, count=cantidad, offset=INICIO_REGISTROS + inicio * REGISTRO.size)
+
+    def _filas_trozo(self, inicio):
+        """Como _filas, pero solo los registros entre inicio e inicio + TAMANO_TROZO"""
+        fin = min(inicio + TAMANO_TROZO, self.usados)
+        return list(REGISTRO.iter_unpack(
+            self.mapa[INICIO_REGISTROS + inicio * REGISTRO.size:INICIO_REGISTROS + fin * REGISTRO.size]
+        ))
+
+    def _fecha(self, clave):
+        return struct.unpack_from("<i", self.mapa, INICIO_REGISTROS + clave * REGISTRO.size + 16)[0]
+
+    # Interfaz común con RegistrosJSON y RegistrosSQLite
+    def _existe(self, clave):
+        return 0 <= clave < self.usados and self._fecha(clave) != FECHA_BORRADA
+
+    def __len__(self):
+        return self.usados - self.borrados
+
+    def __iter__(self):
+        for clave in self._claves_vivas():
+            yield RegistroVista(self, clave)
+
+    def __getitem__(self, clave):
+        if not self._existe(clave):
+            raise KeyError(clave)
+        return RegistroVista(self, clave)
+
+    def items(self):
+        for registro in self:
+            yield registro.clave, registro
+
+    def _claves_vivas(self):
+        """Genera las claves de los registros vivos, recorriendo el archivo por trozos"""
+        for inicio in range(0, self.usados, TAMANO_TROZO):
+            if np is not None:
+                claves = (np.nonzero(self._vista_trozo(inicio)["fecha"] != FECHA_BORRADA)[0] + inicio).tolist()
+            else:
+                claves = [
+                    clave for clave, fila in enumerate(self._filas_trozo(inicio), start=inicio)
+                    if fila[2] != FECHA_BORRADA
+                ]
+            yield from claves
+
+    def valor(self, clave, campo):
+        """Lee un campo de un registro, con el mismo tipo que tendría en el dict original"""
+        monto, monto_convertido, fecha, moneda, moneda_principal, estado = REGISTRO.unpack_from(
+            self.mapa, INICIO_REGISTROS + clave * REGISTRO.size
+        )
+        if campo == "fecha":
+            return ordinal_a_fecha(fecha)
+        if campo == "monto":
+            return monto
+        if campo == "moneda":
+            return self.codigos_moneda.valores[moneda]
+        if campo == "monto_convertido":
+            return None if math.isnan(monto_convertido) else monto_convertido
+        if campo == "moneda_principal":
+            return self.codigos_moneda.valores[moneda_principal]
+        if campo == "estado":
+            return self.codigos_estado.valores[estado]
+        raise KeyError(campo)
+
+    def _insertar(self, registro):
+        if self.usados == self.capacidad:
+            self._crecer()
+        clave = self.usados
+        monto_convertido = registro.get("monto_convertido")
+        REGISTRO.pack_into(
+            self.mapa, INICIO_REGISTROS + clave * REGISTRO.size,
+            float(registro.get("monto", 0)),
+            math.nan if monto_convertido is None else float(monto_convertido),
+            fecha_a_ordinal(registro["fecha"]),
+            self.codigos_moneda.codigo(registro.get("moneda", "USD")),
+            self.codigos_moneda.codigo(registro.get("moneda_principal")),
+            self.codigos_estado.codigo(registro.get("estado"))
+        )
+        self.usados += 1
+        return clave
+
+    def _cantidad_codigos(self):
+        return len(self.codigos_moneda.valores) + len(self.codigos_estado.valores)
+
+    def agregar(self, registro):
+        """Escribe un registro al final del archivo (24 bytes más la cabecera)"""
+        codigos = self._cantidad_codigos()
+        clave = self._insertar(registro)
+        if self._cantidad_codigos() != codigos:
+            self._escribir_codigos()
+        self._escribir_cabecera()
+        return clave
+
+    def agregar_varios(self, registros):
+        """Agrega muchos registros y actualiza la cabecera una vez; si uno falla no queda ninguno"""
+        inicio = self.usados
+        codigos = self._cantidad_codigos()
+        try:
+            for registro in registros:
+                self._insertar(registro)
+        except Exception:
+            # Los registros escritos quedan más allá de `usados`: es como si no existieran
+            self.usados = inicio
+            raise
+        finally:
+            if self._cantidad_codigos() != codigos:
+                self._escribir_codigos()
+            self._escribir_cabecera()
+        return self.usados - inicio
+
+    def borrar(self, clave):
+        """Borra un registro dejando un hueco; devuelve el registro como dict"""
+        registro = self[clave].a_dict()
+        desplazamiento = INICIO_REGISTROS + clave * REGISTRO.size
+        _, _, _, moneda, moneda_principal, estado = REGISTRO.unpack_from(self.mapa, desplazamiento)
+        REGISTRO.pack_into(self.mapa, desplazamiento, 0.0, 0.0, FECHA_BORRADA, moneda, moneda_principal, estado)
+        self.borrados += 1
+        self._escribir_cabecera()
+        return registro
+
+    def reconvertir(self, converter, moneda_principal):
+        """Recalcula monto_convertido de todo el archivo con la tasa de la fecha de cada registro"""
+        codigo_principal = self.codigos_moneda.codigo(moneda_principal)
+        for inicio in range(0, self.usados, TAMANO_TROZO):
+            if np is not None:
+                trozo = self._vista_trozo(inicio)
+                trozo["monto_convertido"] = converter.convert_many_at(
+                    trozo["monto"], trozo["moneda"], moneda_principal, trozo["fecha"],
+                    currency_names=self.codigos_moneda.valores
+                )
+                trozo["moneda_principal"] = codigo_principal
+                del trozo
+            else:
+                filas = self._filas_trozo(inicio)
+                convertidos = converter.convert_many_at(
+                    [fila[0] for fila in filas], [fila[3] for fila in filas], moneda_principal,
+                    [fila[2] for fila in filas], currency_names=self.codigos_moneda.valores
+                )
+                for clave, (fila, convertido) in enumerate(zip(filas, convertidos), start=inicio):
+                    REGISTRO.pack_into(
+                        self.mapa, INICIO_REGISTROS + clave * REGISTRO.size,
+                        fila[0], convertido, fila[2], fila[3], codigo_principal, fila[5]
+                    )
+        self._escribir_codigos()
+        self.guardar()
+
+    def guardar(self):
+        """Los cambios ya están en el archivo mapeado: esto los baja a disco"""
+        self.mapa.flush()
+
+    # Consultas
+    def claves_por_fecha(self):
+        """Claves de los registros, del más reciente al más antiguo"""
+        if np is not None:
+            fechas = self._vista()["fecha"]
+            # Orden estable: a igual fecha se respeta el orden de carga
+            claves = np.argsort(-fechas, kind="stable").tolist()
+        else:
+            fechas = [fila[2] for fila in self._filas()]
+            claves = sorted(range(len(fechas)), key=fechas.__getitem__, reverse=True)
+        # Los huecos (fecha 0) quedan al final
+        return claves[:len(self)]
+
+    def sumas_por_moneda(self):
+        if np is not None and self.usados:
+            vista = self._vista()
+            vivos = vista["fecha"] != FECHA_BORRADA
+            monedas = vista["moneda"][vivos]
+            sumas = np.bincount(monedas, weights=vista["monto"][vivos])
+            return {
+                self.codigos_moneda.valores[codigo]: float(sumas[codigo])
+                for codigo in np.nonzero(np.bincount(monedas))[0].tolist()
+            }
+        sumas = {}
+        for monto, _, fecha, moneda, _, _ in self._filas():
+            if fecha != FECHA_BORRADA:
+                sumas[moneda] = sumas.get(moneda, 0.0) + monto
+        return {self.codigos_moneda.valores[codigo]: suma for codigo, suma in sumas.items()}
+
+    def resumen_por_fecha(self):
+        """Genera (fecha, cantidad, suma de montos) por cada día con registros"""
+        if np is not None and self.usados:
+            vista = self._vista()
+            vivos = vista["fecha"] != FECHA_BORRADA
+            dias, posiciones, cantidades = np.unique(vista["fecha"][vivos], return_inverse=True, return_counts=True)
+            sumas = np.bincount(posiciones, weights=vista["monto"][vivos])
+            # Se pasan a listas antes de generar: una vista viva impediría agrandar el archivo
+            resumen = list(zip(dias.tolist(), cantidades.tolist(), sumas.tolist()))
+            del vista
+        else:
+            por_dia = {}
+            for monto, _, fecha, _, _, _ in self._filas():
+                if fecha != FECHA_BORRADA:
+                    cantidad, suma = por_dia.get(fecha, (0, 0.0))
+                    por_dia[fecha] = (cantidad + 1, suma + monto)
+            resumen = [(fecha, cantidad, suma) for fecha, (cantidad, suma) in por_dia.items()]
+        for dia, cantidad, suma in resumen:
+            yield ordinal_a_fecha(dia), cantidad, suma
+
+    def claves_entre(self, desde, hasta):
+        """Genera las claves con fecha entre desde y hasta (inclusive), recorriendo el archivo por trozos"""
+        inicio = fecha_a_ordinal(desde)
+        fin = fecha_a_ordinal(hasta)
+        for primera in range(0, self.usados, TAMANO_TROZO):
+            if np is not None:
+                fechas = self._vista_trozo(primera)["fecha"]
+                # A lista antes de generar: una vista viva impediría agrandar el archivo
+                claves = (np.nonzero((fechas >= inicio) & (fechas <= fin))[0] + primera).tolist()
+                del fechas
+            else:
+                claves = [
+                    clave for clave, fila in enumerate(self._filas_trozo(primera), start=primera)
+                    if inicio <= fila[2] <= fin
+                ]
+            yield from claves
+
+    def items_entre(self, desde, hasta):
+        """Pares (clave, registro) con fecha entre desde y hasta (inclusive)"""
+        for clave in self.claves_entre(desde, hasta):
+            yield clave, RegistroVista(self, clave)
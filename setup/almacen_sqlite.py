@@ -0,0 +1,159 @@
+import os
+import sqlite3
+
+COLUMNAS = ("fecha", "monto", "moneda", "monto_convertido", "moneda_principal", "estado")
+# Filas por lote al reconvertir, para no traer la tabla entera a memoria
+LOTE_RECONVERSION = 50_000
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS registros (
+    id INTEGER PRIMARY KEY,
+    fecha TEXT NOT NULL,
+    monto REAL NOT NULL,
+    moneda TEXT NOT NULL,
+    monto_convertido REAL,
+    moneda_principal TEXT,
+    estado TEXT
+);
+-- Índices "cubrientes": los totales por día y por moneda se leen sin tocar la tabla
+CREATE INDEX IF NOT EXISTS idx_registros_fecha ON registros(fecha, monto);
+CREATE INDEX IF NOT EXISTS idx_registros_moneda ON registros(moneda, monto);
+"""
+
+
+def abrir_sqlite(ruta_db):
+    """Abre la base SQLite; la primera vez migra los datos existentes de datos.json"""
+    nueva = not os.path.exists(ruta_db)
+    registros = RegistrosSQLite(ruta_db)
+    if nueva:
+        migrar_desde_json(registros)
+    return registros
+
+
+def migrar_desde_json(registros):
+    """Copia el snapshot JSON (más su diario) a la base SQLite en una sola transacción"""
+    from setup.estado import leer_datos_json
+
+    datos = leer_datos_json()
+    if datos:
+        registros.agregar_varios(datos)
+        print(f"Migrados {len(datos)} registros de datos.json a SQLite")
+
+
+class RegistrosSQLite:
+    """Registros guardados en SQLite; las vistas consultan agregados sin cargar todo en memoria.
+
+    Ofrece la misma interfaz que RegistrosJSON: la clave de cada registro es su rowid.
+    """
+
+    def __init__(self, ruta_db):
+        self.conexion = sqlite3.connect(ruta_db)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(ESQUEMA)
+        self._cantidad = self.conexion.execute("SELECT COUNT(*) FROM registros").fetchone()[0]
+
+    def _a_registro(self, fila):
+        return dict(zip(COLUMNAS, fila))
+
+    def __len__(self):
+        return self._cantidad
+
+    def __iter__(self):
+        cursor = self.conexion.execute(f"SELECT {', '.join(COLUMNAS)} FROM registros ORDER BY id")
+        for fila in cursor:
+            yield self._a_registro(fila)
+
+    def __getitem__(self, clave):
+        fila = self.conexion.execute(
+            f"SELECT {', '.join(COLUMNAS)} FROM registros WHERE id = ?", (clave,)
+        ).fetchone()
+        if fila is None:
+            raise KeyError(clave)
+        return self._a_registro(fila)
+
+    def items(self):
+        cursor = self.conexion.execute(f"SELECT id, {', '.join(COLUMNAS)} FROM registros ORDER BY id")
+        for fila in cursor:
+            yield fila[0], self._a_registro(fila[1:])
+
+    def agregar(self, registro):
+        """Inserta un registro (una sola fila, sin reescribir nada)"""
+        with self.conexion:
+            cursor = self.conexion.execute(
+                f"INSERT INTO registros ({', '.join(COLUMNAS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                tuple(registro.get(columna) for columna in COLUMNAS)
+            )
+        self._cantidad += 1
+        return cursor.lastrowid
+
+    def agregar_varios(self, registros):
+        """Inserta muchos registros (puede ser un generador) en una única transacción"""
+        antes = self.conexion.total_changes
+        filas = (tuple(registro.get(columna) for columna in COLUMNAS) for registro in registros)
+        with self.conexion:
+            self.conexion.executemany(
+                f"INSERT INTO registros ({', '.join(COLUMNAS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                filas
+            )
+        cantidad = self.conexion.total_changes - antes
+        self._cantidad += cantidad
+        return cantidad
+
+    def borrar(self, clave):
+        """Borra un registro por su rowid"""
+        registro = self[clave]
+        with self.conexion:
+            self.conexion.execute("DELETE FROM registros WHERE id = ?", (clave,))
+        self._cantidad -= 1
+        return registro
+
+    def reconvertir(self, converter, moneda_principal):
+        """Recalcula monto_convertido con la tasa de la fecha de cada fila, por lotes de rowid"""
+        ultimo = 0
+        with self.conexion:
+            while True:
+                filas = self.conexion.execute(
+                    "SELECT id, fecha, monto, moneda FROM registros WHERE id > ? ORDER BY id LIMIT ?",
+                    (ultimo, LOTE_RECONVERSION)
+                ).fetchall()
+                if not filas:
+                    break
+                claves, fechas, montos, monedas = zip(*filas)
+                convertidos = converter.convert_many_at(montos, monedas, moneda_principal, fechas)
+                self.conexion.executemany(
+                    "UPDATE registros SET monto_convertido = ?, moneda_principal = ? WHERE id = ?",
+                    ((float(convertido), moneda_principal, clave) for convertido, clave in zip(convertidos, claves))
+                )
+                ultimo = claves[-1]
+
+    def guardar(self):
+        """Cada cambio ya se confirma al hacerse; solo se vuelca el WAL a la base"""
+        self.conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # Consultas agregadas
+    def claves_por_fecha(self):
+        """Claves de los registros, del más reciente al más antiguo"""
+        return (fila[0] for fila in self.conexion.execute(
+            "SELECT id FROM registros ORDER BY fecha DESC, id"
+        ))
+
+    def sumas_por_moneda(self):
+        return dict(self.conexion.execute(
+            "SELECT moneda, SUM(monto) FROM registros GROUP BY moneda"
+        ))
+
+    def resumen_por_fecha(self):
+        """Genera (fecha, cantidad, suma de montos) por cada día con registros"""
+        return self.conexion.execute(
+            "SELECT fecha, COUNT(*), SUM(monto) FROM registros GROUP BY fecha"
+        )
+
+    def items_entre(self, desde, hasta):
+        """Pares (clave, registro) con fecha entre desde y hasta (inclusive)"""
+        cursor = self.conexion.execute(
+            f"SELECT id, {', '.join(COLUMNAS)} FROM registros WHERE fecha BETWEEN ? AND ? ORDER BY fecha, id",
+            (desde, hasta)
+        )
+        for fila in cursor:
+            yield fila[0], self._a_registro(fila[1:])
@@ -0,0 +1,97 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# Tiempo objetivo hasta que se ve la ventana principal
+PRESUPUESTO_ARRANQUE_MS = 500
+# Niveles de imports anidados que se muestran en la traza
+PROFUNDIDAD_IMPORTS = 2
+
+_INICIO = time.perf_counter()
+
+
+class TrazaArranque:
+    """Mide imports y etapas de inicialización hasta el primer cuadro (--startup-trace).
+
+    Desactivada no instala nada: `etapa` devuelve un contexto vacío y
+    `al_mostrar` no hace nada, así el arranque normal no paga la medición.
+    """
+
+    def __init__(self, activa=False):
+        self.activa = activa
+        self.imports = []  # [profundidad, módulo, segundos]
+        self.etapas = []   # (nombre, segundos)
+        self._import_original = None
+
+    def medir_imports(self):
+        """Reemplaza __import__ para cronometrar cada módulo la primera vez que se carga"""
+        if not self.activa or self._import_original is not None:
+            return
+        original = self._import_original = builtins.__import__
+        profundidad = [0]
+
+        def importar(nombre, globales=None, locales=None, desde=(), nivel=0):
+            if nombre in sys.modules or profundidad[0] >= PROFUNDIDAD_IMPORTS:
+                return original(nombre, globales, locales, desde, nivel)
+            entrada = [profundidad[0], nombre, 0.0]
+            self.imports.append(entrada)
+            profundidad[0] += 1
+            inicio = time.perf_counter()
+            try:
+                return original(nombre, globales, locales, desde, nivel)
+            finally:
+                entrada[2] = time.perf_counter() - inicio
+                profundidad[0] -= 1
+
+        builtins.__import__ = importar
+
+    def dejar_de_medir_imports(self):
+        if self._import_original is not None:
+            builtins.__import__ = self._import_original
+            self._import_original = None
+
+    def etapa(self, nombre):
+        """Contexto que cronometra una etapa de la inicialización"""
+        if not self.activa:
+            return nullcontext()
+        return self._medir_etapa(nombre)
+
+    @contextmanager
+    def _medir_etapa(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapas.append((nombre, time.perf_counter() - inicio))
+
+    def al_mostrar(self, ventana):
+        """Imprime la traza cuando la ventana principal se muestra por primera vez"""
+        if not self.activa:
+            return
+
+        def mostrada(event):
+            if event.widget is ventana:
+                ventana.unbind("<Map>", identificador)
+                self.dejar_de_medir_imports()
+                self.informe(time.perf_counter() - _INICIO)
+
+        identificador = ventana.bind("<Map>", mostrada, add="+")
+
+    def informe(self, primer_cuadro, archivo=None):
+        archivo = archivo or sys.stderr
+        print("Traza de arranque (ms)", file=archivo)
+        print("  Imports:", file=archivo)
+        for profundidad, modulo, segundos in self.imports:
+            sangria = "  " * profundidad
+            print(f"    {sangria}{modulo:<{40 - len(sangria)}} {segundos * 1000:8.1f}", file=archivo)
+        print("  Inicialización:", file=archivo)
+        for nombre, segundos in self.etapas:
+            print(f"    {nombre:<40} {segundos * 1000:8.1f}", file=archivo)
+        primer_cuadro_ms = primer_cuadro * 1000
+        estado = "OK" if primer_cuadro_ms <= PRESUPUESTO_ARRANQUE_MS else "EXCEDIDO"
+        print(
+            f"  Primer cuadro: {primer_cuadro_ms:.1f} ms "
+            f"(presupuesto {PRESUPUESTO_ARRANQUE_MS} ms: {estado})",
+            file=archivo
+        )
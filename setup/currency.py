@@ -1,59 +1,151 @@
-import requests
 import json
 from datetime import datetime, timedelta
 import os
+import math
+import queue
+import threading
+
+from setup.historial_tasas import HistorialTasas
+from setup.ledger import fecha_a_ordinal
+from setup.rendimiento import medido
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# API de ExchangeRate-API (gratuita, no requiere clave para el plan básico).
+# Se puede apuntar a otro servidor (por ejemplo uno local en pruebas) con
+# la variable de entorno TRACKER_URL_TASAS o el parámetro url del conversor.
+URL_TASAS = "https://api.exchangerate-api.com/v4/latest/USD"
+
+# Monedas que se muestran primero (y como botones) en la interfaz
+MONEDAS_PRINCIPALES = ["USD", "ARS", "EUR"]
 
 class CurrencyConverter:
-    def __init__(self, app):
+    def __init__(self, app=None, url=None):
         self.app = app
         self.rates = {}
+        # Matriz de tasas cruzadas: matrix[i][j] convierte de currencies[i] a currencies[j]
+        self.currencies = []
+        self.currency_index = {}
+        self.matrix = []
         self.last_update = None
         self.cache_file = "exchange_rates.json"
+        self.url = url or os.environ.get("TRACKER_URL_TASAS", URL_TASAS)
+        # Resultado de la descarga en segundo plano, entregado al hilo de Tk
+        self._resultados = queue.Queue()
+        self._descarga = None
+        # Tasas de cada día en que se descargaron, para convertir a la fecha de cada registro
+        self.historial = HistorialTasas()
+        self.historial.cargar()
         self.load_rates()
     
     def load_rates(self):
-        """Carga las tasas de cambio del archivo de caché"""
+        """Carga las tasas de cambio del archivo de caché; si son viejas las actualiza en segundo plano"""
         try:
             if os.path.exists(self.cache_file):
                 with open(self.cache_file, "r") as f:
                     data = json.load(f)
-                    self.rates = data.get("rates", {})
+                    self.set_rates(data.get("rates", {}))
                     self.last_update = datetime.fromisoformat(data.get("last_update", "2000-01-01"))
                     
                     # Verificar si las tasas son antiguas (más de 1 día)
                     if datetime.now() - self.last_update > timedelta(days=1):
-                        self.fetch_latest_rates()
+                        self.refresh_in_background()
             else:
-                self.fetch_latest_rates()
+                # Arrancar con las tasas de respaldo hasta que llegue la descarga
+                self.use_backup_rates()
+                self.refresh_in_background()
         except Exception as e:
             print(f"Error cargando tasas: {e}")
-            self.fetch_latest_rates()
+            self.use_backup_rates()
+            self.refresh_in_background()
+    
+    def refresh_in_background(self):
+        """Descarga las tasas en un hilo aparte, sin bloquear el arranque de la ventana"""
+        ventana = getattr(self.app, "ventana", None)
+        if ventana is None:
+            # Sin ventana (línea de comandos, cron) no se bloquea esperando la red: se
+            # siguen usando las tasas de la caché o las de respaldo, y la descarga se
+            # pide explícitamente con fetch_latest_rates (tracker --actualizar-tasas)
+            return
+        if self._descarga is not None and self._descarga.is_alive():
+            return
+        
+        def trabajo():
+            try:
+                self._resultados.put(self.download_rates())
+            except Exception as e:
+                print(f"Error obteniendo tasas: {e}")
+                self._resultados.put(None)
+        
+        self._descarga = threading.Thread(target=trabajo, name="descarga-tasas", daemon=True)
+        self._descarga.start()
+        ventana.after(100, self._check_download)
+    
+    def _check_download(self):
+        """Revisa desde el loop de Tk si el hilo de descarga ya terminó"""
+        try:
+            rates = self._resultados.get_nowait()
+        except queue.Empty:
+            self.app.ventana.after(100, self._check_download)
+            return
+        
+        if rates:
+            self.apply_rates(rates)
+            # Las tasas nuevas cambian el balance convertido
+            if hasattr(self.app, "refresco"):
+                self.app.refresco.marcar("balance")
     
+    @medido("CurrencyConverter.download_rates")
+    def download_rates(self):
+        """Descarga las tasas (solo red: se puede llamar desde cualquier hilo)"""
+        # Import diferido: requests (con urllib3 y charset) tarda en cargar y solo
+        # hace falta cuando se descarga, que ocurre en segundo plano
+        import requests
+        
+        response = requests.get(self.url, timeout=10)
+        if response.status_code != 200:
+            print(f"Error obteniendo tasas: HTTP {response.status_code}")
+            return None
+        
+        data = response.json()
+        # Guardar todas las monedas que devuelve la API (con respaldo para las principales)
+        all_rates = {
+            currency: float(rate)
+            for currency, rate in data.get("rates", {}).items()
+            if rate
+        }
+        all_rates.setdefault("ARS", 950.0)
+        all_rates.setdefault("EUR", 0.92)
+        all_rates["USD"] = 1.0
+        return all_rates
+    
+    def apply_rates(self, rates):
+        """Aplica tasas nuevas y las guarda en la caché"""
+        self.set_rates(rates)
+        self.last_update = datetime.now()
+        self.historial.registrar(self.last_update.date().isoformat(), rates)
+        
+        # Guardar en caché
+        cache_data = {
+            "rates": self.rates,
+            "last_update": self.last_update.isoformat()
+        }
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(cache_data, f, indent=2)
+        except OSError as e:
+            print(f"Error guardando tasas: {e}")
+    
+    @medido("CurrencyConverter.fetch_latest_rates")
     def fetch_latest_rates(self):
-        """Obtiene las tasas de cambio más recientes de una API gratuita"""
+        """Obtiene las tasas de cambio más recientes de forma sincrónica"""
         try:
-            # API de ExchangeRate-API (gratuita, no requiere clave para el plan básico)
-            response = requests.get("https://api.exchangerate-api.com/v4/latest/USD", timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # SOLO GUARDAR LAS MONEDAS QUE NECESITAMOS
-                all_rates = data.get("rates", {})
-                self.rates = {
-                    "USD": 1.0,
-                    "ARS": all_rates.get("ARS", 950.0),
-                    "EUR": all_rates.get("EUR", 0.92)
-                }
-                self.last_update = datetime.now()
-                
-                # Guardar en caché
-                cache_data = {
-                    "rates": self.rates,
-                    "last_update": self.last_update.isoformat()
-                }
-                with open(self.cache_file, "w") as f:
-                    json.dump(cache_data, f, indent=2)
-                
+            rates = self.download_rates()
+            if rates:
+                self.apply_rates(rates)
                 return True
             else:
                 # Si falla la API principal, usar tasas de respaldo
@@ -67,45 +159,133 @@ class CurrencyConverter:
     
     def use_backup_rates(self):
         """Usa tasas de cambio de respaldo si la API falla"""
-        # SOLO LAS 3 MONEDAS QUE NECESITAMOS
-        self.rates = {
+        self.set_rates({
             "USD": 1.0,
             "ARS": 950.0,  # Dólar oficial aproximado
             "EUR": 0.92
-        }
+        })
         self.last_update = datetime.now()
     
+    def set_rates(self, rates):
+        """Guarda las tasas (contra USD) y precalcula la matriz de tasas cruzadas"""
+        self.rates = rates
+        self.currencies = [currency for currency in MONEDAS_PRINCIPALES if currency in rates]
+        self.currencies += sorted(currency for currency in rates if currency not in MONEDAS_PRINCIPALES)
+        self.currency_index = {currency: i for i, currency in enumerate(self.currencies)}
+        
+        usd_rates = [float(rates[currency]) for currency in self.currencies]
+        if np is not None:
+            vector = np.asarray(usd_rates, dtype=np.float64)
+            self.matrix = (vector[np.newaxis, :] / vector[:, np.newaxis]).tolist()
+        else:
+            self.matrix = [
+                [to_rate / from_rate for to_rate in usd_rates]
+                for from_rate in usd_rates
+            ]
+    
     def convert(self, amount, from_currency, to_currency):
         """Convierte una cantidad de una moneda a otra"""
         if from_currency == to_currency:
             return amount
         
-        if from_currency not in self.rates or to_currency not in self.rates:
+        i = self.currency_index.get(from_currency)
+        j = self.currency_index.get(to_currency)
+        if i is None or j is None:
             return amount  # No se puede convertir, devolver la cantidad original
         
-        # Convertir a USD primero (si no es USD)
-        if from_currency != "USD":
-            amount_in_usd = amount / self.rates[from_currency]
-        else:
-            amount_in_usd = amount
-        
-        # Convertir de USD a la moneda destino
-        if to_currency != "USD":
-            return amount_in_usd * self.rates[to_currency]
-        else:
-            return amount_in_usd
+        return amount * self.matrix[i][j]
     
     def get_all_currencies(self):
-        """Devuelve todas las monedas disponibles"""
-        # SOLO LAS 3 QUE QUERÉS
-        return ["USD", "ARS", "EUR"]
+        """Devuelve todas las monedas disponibles (las principales primero)"""
+        return list(self.currencies)
     
     def get_rate(self, from_currency, to_currency):
         """Obtiene la tasa de cambio entre dos monedas"""
         if from_currency == to_currency:
             return 1.0
         
-        if from_currency not in self.rates or to_currency not in self.rates:
+        i = self.currency_index.get(from_currency)
+        j = self.currency_index.get(to_currency)
+        if i is None or j is None:
             return None
         
-        return self.rates[to_currency] / self.rates[from_currency]
+        return self.matrix[i][j]
+    
+    def convert_many(self, amounts, currencies, to_currency, currency_names=None):
+        """Convierte una columna entera de montos a otra moneda en una sola operación.
+        
+        Arma una vez el factor de cada moneda y lo aplica a toda la columna
+        (con NumPy si está instalado). Si se pasa `currency_names`, `currencies`
+        son códigos enteros que indexan esa lista, como las columnas del Ledger.
+        """
+        if currency_names is None:
+            currency_names = sorted(set(currencies))
+            codes = {currency: code for code, currency in enumerate(currency_names)}
+            currencies = [codes[currency] for currency in currencies]
+        
+        # Sin tasa conocida el factor es 1: se devuelve la cantidad original, como en convert
+        factors = [self.get_rate(currency, to_currency) or 1.0 for currency in currency_names]
+        
+        if np is not None:
+            amounts = np.asarray(amounts, dtype=np.float64)
+            if not len(factors):
+                return amounts.copy()
+            codes = np.asarray(currencies, dtype=np.intp)
+            return amounts * np.asarray(factors, dtype=np.float64)[codes]
+        
+        return [amount * factors[code] for amount, code in zip(amounts, currencies)]
+    
+    def convert_at(self, amount, from_currency, to_currency, fecha):
+        """Convierte una cantidad con las tasas vigentes en una fecha ('AAAA-MM-DD')"""
+        if from_currency == to_currency:
+            return amount
+        
+        from_rate = self._rate_at(from_currency, fecha)
+        to_rate = self._rate_at(to_currency, fecha)
+        if from_rate is None or to_rate is None:
+            return amount  # No se puede convertir, devolver la cantidad original
+        
+        return amount / from_rate * to_rate
+    
+    def _rate_at(self, currency, fecha):
+        """Tasa contra USD en una fecha; sin historial para ese día se usa la actual"""
+        rate = self.historial.tasa(currency, fecha)
+        return self.rates.get(currency) if rate is None else rate
+    
+    def convert_many_at(self, amounts, currencies, to_currency, fechas, currency_names=None):
+        """Convierte columnas enteras de montos con las tasas vigentes en la fecha de cada uno.
+        
+        `fechas` puede tener 'AAAA-MM-DD' u ordinales de día. Si se pasa
+        `currency_names`, `currencies` son códigos enteros que indexan esa lista
+        (como las columnas del Ledger). Con NumPy las tasas salen de una tabla
+        monedas × fechas del historial indexada por código y posición, sin
+        trabajo por fila en Python.
+        """
+        if not len(self.historial):
+            # Sin historial (línea de comandos, sin conexión) toda fecha usa las tasas actuales
+            return self.convert_many(amounts, currencies, to_currency, currency_names)
+        if currency_names is None:
+            currency_names = sorted(set(currencies))
+            codes = {currency: code for code, currency in enumerate(currency_names)}
+            currencies = [codes[currency] for currency in currencies]
+        
+        if np is not None:
+            ordinales = np.asarray(fechas)
+            if ordinales.dtype.kind not in "iu":
+                ordinales = np.array([fecha_a_ordinal(fecha) for fecha in fechas], dtype=np.int32)
+            posiciones = self.historial.posiciones(ordinales)
+            # La última fila de la tabla es la moneda destino
+            tabla = self.historial.tabla(
+                list(currency_names) + [to_currency], lambda currency: self.rates.get(currency, math.nan)
+            )
+            codes = np.asarray(currencies, dtype=np.intp)
+            amounts = np.asarray(amounts, dtype=np.float64)
+            converted = amounts / tabla[codes, posiciones] * tabla[-1, posiciones]
+            # Sin tasa conocida se devuelve la cantidad original, como en convert
+            mismas = np.asarray([currency == to_currency for currency in currency_names], dtype=bool)
+            return np.where(np.isnan(converted) | mismas[codes], amounts, converted)
+        
+        return [
+            self.convert_at(amount, currency_names[code], to_currency, fecha)
+            for amount, code, fecha in zip(amounts, currencies, fechas)
+        ]
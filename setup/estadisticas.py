@@ -0,0 +1,65 @@
+class Estadisticas:
+    """Totales del panel de ESTADÍSTICAS mantenidos de forma incremental.
+
+    Se calculan una vez al cargar y luego cada alta o baja los ajusta en O(1),
+    sin volver a recorrer el ledger.
+    """
+
+    def __init__(self):
+        self.total = 0.0
+        self.cantidad = 0
+        # Cantidad de registros por fecha: un día deja de contar cuando llega a 0
+        self.registros_por_fecha = {}
+        # Suma de montos por moneda original: el balance se obtiene con una
+        # multiplicación por moneda en lugar de convertir cada registro
+        self.sumas_por_moneda = {}
+
+    @classmethod
+    def desde(cls, registros):
+        """Arma las estadísticas con el resumen por fecha del almacenamiento"""
+        estadisticas = cls()
+        for fecha, cantidad, suma in registros.resumen_por_fecha():
+            estadisticas.registros_por_fecha[fecha] = cantidad
+            estadisticas.cantidad += cantidad
+            estadisticas.total += suma
+        estadisticas.sumas_por_moneda = dict(registros.sumas_por_moneda())
+        return estadisticas
+
+    def alta(self, registro):
+        fecha = registro["fecha"]
+        self.total += registro["monto"]
+        self.cantidad += 1
+        self.registros_por_fecha[fecha] = self.registros_por_fecha.get(fecha, 0) + 1
+        moneda = registro.get("moneda", "USD")
+        self.sumas_por_moneda[moneda] = self.sumas_por_moneda.get(moneda, 0.0) + registro["monto"]
+
+    def baja(self, registro):
+        fecha = registro["fecha"]
+        self.total -= registro["monto"]
+        self.cantidad -= 1
+        restantes = self.registros_por_fecha.get(fecha, 0) - 1
+        if restantes > 0:
+            self.registros_por_fecha[fecha] = restantes
+        else:
+            self.registros_por_fecha.pop(fecha, None)
+        moneda = registro.get("moneda", "USD")
+        self.sumas_por_moneda[moneda] = self.sumas_por_moneda.get(moneda, 0.0) - registro["monto"]
+        if self.cantidad == 0:
+            # Sin registros los totales son exactamente 0 (descarta el error de redondeo acumulado)
+            self.total = 0.0
+            self.sumas_por_moneda = {}
+
+    @property
+    def promedio(self):
+        return self.total / self.cantidad if self.cantidad else 0
+
+    @property
+    def dias(self):
+        return len(self.registros_por_fecha)
+
+    def balance(self, balance_inicial, obtener_tasa, moneda_principal):
+        """Balance inicial más cada suma por moneda convertida a la moneda principal"""
+        total_transacciones = 0
+        for moneda, suma in self.sumas_por_moneda.items():
+            total_transacciones += suma * obtener_tasa(moneda, moneda_principal)
+        return balance_inicial + total_transacciones
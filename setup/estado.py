@@ -1,6 +1,20 @@
 import json
 import os
 
+from setup.ledger import Ledger
+from setup.rendimiento import medido
+
+ARCHIVO_DATOS = "datos.json"
+ARCHIVO_DIARIO = "datos.diario.jsonl"
+ARCHIVO_SQLITE = "datos.db"
+# Con almacenamiento "anual", un archivo por año (datos/2025.json) y un manifiesto
+DIRECTORIO_ANUAL = "datos"
+# Con almacenamiento "binario", registros de ancho fijo leídos con mmap
+ARCHIVO_BINARIO = "datos.ledger"
+# El diario se compacta cuando supera este tamaño o la mitad del snapshot,
+# lo que sea mayor, para que el costo de compactar se reparta entre muchas escrituras
+UMBRAL_DIARIO_MINIMO = 1024 * 1024
+
 def configurarColoresYEstado(app):
     # Colores modernos para tema oscuro
     app.color_fondo = "#121212"
@@ -24,17 +38,150 @@ def configurarColoresYEstado(app):
     app.color_boton_borrar = "#FF5252"       # Rojo claro
     app.color_boton_calendario = "#9C27B0"   # Morado
     app.color_boton_neutral = "#6200EE"      # Morado oscuro
-    
-    app.datos = cargar_datos(app)
-    app.configuracion = cargar_configuracion(app)
 
-def cargar_datos(app):
-    """Carga los datos desde el archivo JSON"""
+def abrir_registros(configuracion):
+    """Abre el almacenamiento indicado en la configuración, sin depender de la interfaz"""
+    if configuracion.get("almacenamiento") == "sqlite":
+        # Import diferido: el backend SQLite es opcional
+        from setup.almacen_sqlite import abrir_sqlite
+        return abrir_sqlite(ARCHIVO_SQLITE)
+    if configuracion.get("almacenamiento") == "anual":
+        from setup.almacen_anual import abrir_anual
+        return abrir_anual(DIRECTORIO_ANUAL)
+    if configuracion.get("almacenamiento") == "binario":
+        from setup.almacen_binario import abrir_binario
+        return abrir_binario(ARCHIVO_BINARIO)
+    return RegistrosJSON(leer_datos_json())
+
+def leer_datos_json(ruta_datos=ARCHIVO_DATOS, ruta_diario=ARCHIVO_DIARIO):
+    """Lee el snapshot JSON y reaplica el diario de cambios"""
+    completar_guardado(ruta_datos, ruta_diario)
     try:
-        with open("datos.json", "r") as archivo:
-            return json.load(archivo)
+        with open(ruta_datos, "r") as archivo:
+            datos = json.load(archivo)
     except FileNotFoundError:
-        return []
+        datos = []
+    return reaplicar_diario(datos, ruta_diario)
+
+def reaplicar_diario(datos, ruta_diario=ARCHIVO_DIARIO):
+    """Aplica sobre el snapshot las altas y bajas anotadas en el diario"""
+    if not os.path.exists(ruta_diario):
+        return datos
+
+    # Las bajas se identifican por contenido: dos registros iguales son intercambiables
+    registros = list(datos)
+    posiciones = {}
+    for i, registro in enumerate(registros):
+        posiciones.setdefault(_clave_registro(registro), []).append(i)
+
+    with open(ruta_diario, "r", encoding="utf-8") as diario:
+        for linea in diario:
+            try:
+                cambio = json.loads(linea)
+            except ValueError:
+                # Una línea cortada por un cierre inesperado se descarta
+                continue
+            registro = cambio.get("registro")
+            if cambio.get("op") == "alta":
+                posiciones.setdefault(_clave_registro(registro), []).append(len(registros))
+                registros.append(registro)
+            elif cambio.get("op") == "baja":
+                pendientes = posiciones.get(_clave_registro(registro))
+                if pendientes:
+                    registros[pendientes.pop()] = None
+
+    return [registro for registro in registros if registro is not None]
+
+def _clave_registro(registro):
+    # Los montos se comparan como float: el snapshot puede tener 5 y el diario 5.0
+    normalizado = dict(registro)
+    for campo in ("monto", "monto_convertido"):
+        if normalizado.get(campo) is not None:
+            normalizado[campo] = float(normalizado[campo])
+    return json.dumps(normalizado, sort_keys=True)
+
+def anotar_cambio(ruta_diario, operacion, registro):
+    """Agrega un alta o una baja al final de un diario; devuelve el tamaño del diario"""
+    with open(ruta_diario, "a", encoding="utf-8") as diario:
+        diario.write(json.dumps({"op": operacion, "registro": registro}) + "\n")
+        return diario.tell()
+
+def escribir_snapshot(ruta_datos, ruta_diario, registros):
+    """Escribe un snapshot completo y vacía su diario sin que un corte reaplique cambios.
+
+    El snapshot se escribe entero en un temporal; recién entonces el diario
+    se renombra a .aplicado, que marca que el temporal ya incluye sus
+    cambios. Si el proceso se corta antes de borrar esa marca,
+    completar_guardado termina el trabajo en la próxima lectura.
+    """
+    temporal = ruta_datos + ".tmp"
+    with open(temporal, "w") as archivo:
+        json.dump(registros, archivo, indent=2)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    aplicado = ruta_diario + ".aplicado"
+    if os.path.exists(ruta_diario):
+        os.replace(ruta_diario, aplicado)
+    os.replace(temporal, ruta_datos)
+    if os.path.exists(aplicado):
+        os.remove(aplicado)
+
+def completar_guardado(ruta_datos, ruta_diario):
+    """Termina un escribir_snapshot cortado después de marcar el diario como aplicado"""
+    aplicado = ruta_diario + ".aplicado"
+    if not os.path.exists(aplicado):
+        return
+    temporal = ruta_datos + ".tmp"
+    # Sin temporal, el snapshot ya se había reemplazado: solo falta borrar la marca
+    if os.path.exists(temporal):
+        os.replace(temporal, ruta_datos)
+    os.remove(aplicado)
+
+def tamano_archivo(ruta):
+    try:
+        return os.path.getsize(ruta)
+    except OSError:
+        return 0
+
+
+class RegistrosJSON(Ledger):
+    """Ledger persistido como snapshot JSON más un diario de cambios"""
+
+    def agregar(self, registro):
+        """Agrega un registro y lo anota en el diario"""
+        clave = super().agregar(registro)
+        self._registrar_cambio("alta", self[clave].a_dict())
+        return clave
+
+    def agregar_varios(self, registros):
+        """Agrega muchos registros y guarda un único snapshot en lugar de anotar cada alta"""
+        cantidad = super().agregar_varios(registros)
+        if cantidad:
+            self.guardar()
+        return cantidad
+
+    def borrar(self, clave):
+        """Borra un registro por clave y anota la baja en el diario"""
+        registro = super().borrar(clave)
+        self._registrar_cambio("baja", registro)
+        return registro
+
+    def reconvertir(self, converter, moneda_principal):
+        """Reconvierte todos los registros y guarda un snapshot (el diario no lo puede expresar)"""
+        super().reconvertir(converter, moneda_principal)
+        self.guardar()
+
+    @medido("RegistrosJSON._registrar_cambio")
+    def _registrar_cambio(self, operacion, registro):
+        """Anota un alta o una baja en el diario, sin reescribir todo el archivo de datos"""
+        tamano_diario = anotar_cambio(ARCHIVO_DIARIO, operacion, registro)
+        if tamano_diario > max(UMBRAL_DIARIO_MINIMO, tamano_archivo(ARCHIVO_DATOS) // 2):
+            self.guardar()
+
+    @medido("RegistrosJSON.guardar")
+    def guardar(self):
+        """Escribe un snapshot completo de los datos y vacía el diario"""
+        escribir_snapshot(ARCHIVO_DATOS, ARCHIVO_DIARIO, list(self.a_dicts()))
 
 def cargar_configuracion(app):
     """Carga la configuración de la aplicación"""
@@ -43,7 +190,9 @@ def cargar_configuracion(app):
         "moneda_principal": "ARS",  # Moneda local por defecto
         "balance_total": 0.0,
         "tasa_manual_usd": 1500.0,   # Tasa manual para USD si la API falla
-        "tasa_manual_eur": 1020.0   # Tasa manual para EUR
+        "tasa_manual_eur": 1020.0,   # Tasa manual para EUR
+        "almacenamiento": "json",   # "json" o "sqlite" para ledgers muy grandes
+        "tabla_virtual": "auto"     # true/false, o "auto" según la cantidad de registros
     }
     
     try:
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+
+from setup.ledger import CAMPOS
+
+# Límites de fecha cuando el filtro deja un extremo abierto
+FECHA_MINIMA = "0001-01-01"
+FECHA_MAXIMA = "9999-12-31"
+
+FORMATOS = ("csv", "jsonl")
+
+
+def registros_filtrados(datos, desde=None, hasta=None, monedas=None):
+    """Genera los registros (como dicts) que cumplen los filtros, sin armar listas intermedias"""
+    if desde or hasta:
+        items = datos.items_entre(desde or FECHA_MINIMA, hasta or FECHA_MAXIMA)
+    else:
+        items = datos.items()
+    monedas = set(monedas) if monedas else None
+    for _, registro in items:
+        if monedas is None or registro["moneda"] in monedas:
+            yield {campo: registro.get(campo) for campo in CAMPOS}
+
+
+def escribir_csv(registros, archivo):
+    escritor = csv.writer(archivo)
+    escritor.writerow(CAMPOS)
+    cantidad = 0
+    for registro in registros:
+        escritor.writerow([registro[campo] for campo in CAMPOS])
+        cantidad += 1
+    return cantidad
+
+
+def escribir_jsonl(registros, archivo):
+    cantidad = 0
+    for registro in registros:
+        archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        cantidad += 1
+    return cantidad
+
+
+def formato_de(ruta):
+    """Formato de exportación según la extensión del archivo (CSV por defecto)"""
+    return "jsonl" if ruta.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def exportar(ruta, datos, formato=None, desde=None, hasta=None, monedas=None):
+    """Exporta los registros filtrados a CSV o JSON Lines, uno por uno; devuelve la cantidad.
+
+    Se escribe en un archivo temporal que reemplaza al destino al terminar,
+    así una exportación interrumpida no deja un archivo a medias.
+    """
+    formato = formato or formato_de(ruta)
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+    registros = registros_filtrados(datos, desde, hasta, monedas)
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", newline="", encoding="utf-8") as archivo:
+        if formato == "csv":
+            cantidad = escribir_csv(registros, archivo)
+        else:
+            cantidad = escribir_jsonl(registros, archivo)
+    os.replace(temporal, ruta)
+    return cantidad
+
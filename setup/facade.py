@@ -1,10 +1,27 @@
+from setup.arranque import TrazaArranque
 from setup.ventana import configurarVentana
 from setup.estado import configurarColoresYEstado
 from setup.ui import crear_interfaz
-from setup.currency import CurrencyConverter
+from setup.nucleo import Tracker
+from setup.refresco import configurarRefresco
 
-def configurar_app(app):
-    configurarVentana(app)
-    configurarColoresYEstado(app)
-    app.converter = CurrencyConverter(app)
-    crear_interfaz(app)
\ No newline at end of file
+def configurar_app(app, traza=None):
+    # Sin --startup-trace la traza está desactivada y cada etapa es un contexto vacío
+    traza = traza or TrazaArranque()
+    with traza.etapa("ventana"):
+        configurarVentana(app)
+    with traza.etapa("colores"):
+        configurarColoresYEstado(app)
+    with traza.etapa("núcleo (datos, estadísticas, tasas)"):
+        # La interfaz es un cliente del núcleo sin Tk
+        app.nucleo = Tracker(app=app)
+        # Se crea al abrir el diagnóstico de memoria por primera vez
+        app.seguimiento_memoria = None
+    with traza.etapa("refresco"):
+        configurarRefresco(app)
+        if hasattr(app.datos, "al_cargar_ano"):
+            # Un año viejo cargado a pedido (calendario, exportación) se suma a la tabla
+            app.datos.al_cargar_ano = lambda ano: app.refresco.marcar("tabla")
+    with traza.etapa("interfaz"):
+        crear_interfaz(app)
+    traza.al_mostrar(app.ventana)
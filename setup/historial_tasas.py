@@ -0,0 +1,103 @@
+import json
+import math
+import os
+from array import array
+from bisect import bisect_right
+
+from setup.ledger import fecha_a_ordinal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class HistorialTasas:
+    """Tasas de cambio (contra USD) por fecha, para convertir a la tasa del día de cada registro.
+
+    Se guarda como {"AAAA-MM-DD": {moneda: tasa}} y en memoria se indexa en
+    arrays ordenados por fecha: la tasa vigente en un día es la del último
+    registro de tasas en o antes de ese día, y se encuentra por bisección.
+    """
+
+    def __init__(self, archivo="exchange_rates_history.json"):
+        self.archivo = archivo
+        self.por_fecha = {}
+        self.ordinales = array("i")
+        self.tasas = {}  # moneda -> array("d") alineado con ordinales (NaN si no hay dato)
+
+    def cargar(self):
+        try:
+            if os.path.exists(self.archivo):
+                with open(self.archivo, "r") as f:
+                    self.por_fecha = json.load(f)
+        except Exception as e:
+            print(f"Error cargando historial de tasas: {e}")
+            self.por_fecha = {}
+        self._indexar()
+
+    def guardar(self):
+        try:
+            with open(self.archivo, "w") as f:
+                json.dump(self.por_fecha, f, indent=2, sort_keys=True)
+        except OSError as e:
+            print(f"Error guardando historial de tasas: {e}")
+
+    def registrar(self, fecha, rates):
+        """Guarda las tasas vigentes en una fecha (pisa las de ese mismo día)"""
+        self.por_fecha[fecha] = dict(rates)
+        self._indexar()
+        self.guardar()
+
+    def _indexar(self):
+        fechas = sorted(self.por_fecha)
+        monedas = set()
+        for fecha in fechas:
+            monedas.update(self.por_fecha[fecha])
+        self.ordinales = array("i", (fecha_a_ordinal(fecha) for fecha in fechas))
+        self.tasas = {
+            moneda: array("d", (float(self.por_fecha[fecha].get(moneda, math.nan)) for fecha in fechas))
+            for moneda in monedas
+        }
+
+    def __len__(self):
+        return len(self.ordinales)
+
+    def _posicion(self, ordinal):
+        # Antes del primer dato se usa el más antiguo que haya
+        return max(bisect_right(self.ordinales, ordinal) - 1, 0)
+
+    def tasa(self, moneda, fecha):
+        """Tasa de una moneda vigente en una fecha ('AAAA-MM-DD' u ordinal); None si no hay dato"""
+        columna = self.tasas.get(moneda)
+        if columna is None:
+            return None
+        ordinal = fecha if isinstance(fecha, int) else fecha_a_ordinal(fecha)
+        tasa = columna[self._posicion(ordinal)]
+        return None if math.isnan(tasa) else tasa
+
+    def posiciones(self, ordinales):
+        """Posición en el historial de la tasa vigente para cada ordinal de un array (NumPy)"""
+        posiciones = np.searchsorted(np.frombuffer(self.ordinales, dtype=np.int32), ordinales, side="right") - 1
+        return np.maximum(posiciones, 0)
+
+    def tabla(self, monedas, respaldo):
+        """Matriz monedas × fechas del historial (NumPy).
+
+        `respaldo` da la tasa actual de cada moneda donde el historial no tiene dato.
+        """
+        tabla = np.empty((len(monedas), len(self.ordinales)), dtype=np.float64)
+        for fila, moneda in enumerate(monedas):
+            columna = self.tasas.get(moneda)
+            if columna is None:
+                tabla[fila] = respaldo(moneda)
+            else:
+                valores = np.frombuffer(columna, dtype=np.float64)
+                tabla[fila] = np.where(np.isnan(valores), respaldo(moneda), valores)
+        return tabla
+
+        tasas = []
+        for moneda, ordinal in zip(monedas, ordinales):
+            tasa = self.tasa(moneda, ordinal) if len(self.ordinales) else None
+            tasas.append(respaldo(moneda) if tasa is None else tasa)
+        return tasas
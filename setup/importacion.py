@@ -0,0 +1,193 @@
+import csv
+import os
+import re
+from datetime import datetime
+
+from setup.nucleo import estado_de
+
+# Cantidad de filas que se convierten juntas con convert_many_at
+TAMANO_LOTE = 5000
+
+# Nombres de columna aceptados en los CSV de los bancos (en minúsculas)
+COLUMNAS_FECHA = ("fecha", "date", "fecha operacion", "fecha operación", "posted date")
+COLUMNAS_MONTO = ("monto", "importe", "amount", "valor")
+COLUMNAS_MONEDA = ("moneda", "currency", "divisa")
+
+FORMATOS_FECHA = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%Y%m%d")
+
+# Etiquetas OFX: tanto SGML (<TRNAMT>-12.50) como XML (<TRNAMT>-12.50</TRNAMT>)
+ETIQUETA_OFX = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+class ErrorImportacion(ValueError):
+    """El archivo no tiene un formato que se pueda importar"""
+
+
+def leer_lineas(archivo, progreso=None):
+    """Genera las líneas de un archivo binario decodificadas, informando los bytes leídos"""
+    total = os.fstat(archivo.fileno()).st_size
+    for numero, linea in enumerate(archivo, 1):
+        try:
+            texto = linea.decode("utf-8")
+        except UnicodeDecodeError:
+            # Muchos bancos exportan en Latin-1
+            texto = linea.decode("latin-1")
+        if progreso is not None and numero % TAMANO_LOTE == 0:
+            progreso(archivo.tell(), total)
+        yield texto.lstrip("\ufeff") if numero == 1 else texto
+
+
+def _buscar_columna(encabezado, nombres):
+    for i, columna in enumerate(encabezado):
+        if columna.strip().lower() in nombres:
+            return i
+    return None
+
+
+def filas_csv(lineas, moneda_por_defecto):
+    """Genera (número de línea, fecha, monto, moneda) crudos de un CSV con encabezado"""
+    lineas = iter(lineas)
+    primera = next(lineas, "")
+    try:
+        delimitador = csv.Sniffer().sniff(primera, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimitador = ","
+
+    def todas():
+        yield primera
+        yield from lineas
+
+    lector = csv.reader(todas(), delimiter=delimitador)
+    try:
+        encabezado = next(lector, [])
+        col_fecha = _buscar_columna(encabezado, COLUMNAS_FECHA)
+        col_monto = _buscar_columna(encabezado, COLUMNAS_MONTO)
+        col_moneda = _buscar_columna(encabezado, COLUMNAS_MONEDA)
+        if col_fecha is None or col_monto is None:
+            raise ErrorImportacion("El CSV necesita columnas de fecha y monto")
+
+        for fila in lector:
+            if not fila:
+                continue
+            moneda = fila[col_moneda] if col_moneda is not None and col_moneda < len(fila) else ""
+            yield (
+                lector.line_num,
+                fila[col_fecha] if col_fecha < len(fila) else "",
+                fila[col_monto] if col_monto < len(fila) else "",
+                moneda.strip().upper() or moneda_por_defecto
+            )
+    except csv.Error as e:
+        # Por ejemplo un campo más largo que csv.field_size_limit o comillas sin cerrar
+        raise ErrorImportacion(f"CSV inválido en la línea {lector.line_num}: {e}") from e
+
+
+def filas_ofx(lineas, moneda_por_defecto):
+    """Genera (número de línea, fecha, monto, moneda) de las transacciones <STMTTRN> de un OFX"""
+    moneda = moneda_por_defecto
+    transaccion = None
+    for numero, linea in enumerate(lineas, 1):
+        for cierre, etiqueta, valor in ETIQUETA_OFX.findall(linea):
+            etiqueta = etiqueta.upper()
+            valor = valor.strip()
+            if etiqueta == "CURDEF" and not cierre:
+                moneda = valor.upper() or moneda
+            elif etiqueta == "STMTTRN":
+                if cierre and transaccion is not None:
+                    yield (
+                        numero,
+                        transaccion.get("DTPOSTED", "")[:8],
+                        transaccion.get("TRNAMT", ""),
+                        transaccion.get("CURRENCY", moneda)
+                    )
+                    transaccion = None
+                elif not cierre:
+                    transaccion = {}
+            elif transaccion is not None and not cierre and valor:
+                transaccion[etiqueta] = valor.upper() if etiqueta == "CURRENCY" else valor
+
+
+def normalizar_fecha(texto):
+    """Devuelve la fecha como 'AAAA-MM-DD' probando los formatos habituales de los bancos"""
+    texto = texto.strip()
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(texto, formato).strftime("%Y-%m-%d")
+        except ValueError:
+            pass
+    raise ValueError(f"fecha inválida: {texto!r}")
+
+
+def normalizar_monto(texto):
+    """Convierte '1.234,56', '1,234.56', '-12.5' o '$ 40' a float"""
+    texto = texto.strip().replace("$", "").replace(" ", "")
+    if "," in texto and "." in texto:
+        # El separador decimal es el que aparece último
+        if texto.rfind(",") > texto.rfind("."):
+            texto = texto.replace(".", "").replace(",", ".")
+        else:
+            texto = texto.replace(",", "")
+    elif "," in texto:
+        texto = texto.replace(",", ".")
+    return float(texto)
+
+
+def validar(filas, errores):
+    """Genera (fecha, monto, moneda) válidos; las filas inválidas se anotan en `errores`"""
+    # Los extractos repiten mucho las fechas: cada texto distinto se interpreta una sola vez
+    fechas = {}
+    for numero, fecha, monto, moneda in filas:
+        try:
+            fecha_normalizada = fechas.get(fecha)
+            if fecha_normalizada is None:
+                fecha_normalizada = fechas[fecha] = normalizar_fecha(fecha)
+            yield fecha_normalizada, normalizar_monto(monto), moneda
+        except ValueError as e:
+            errores.append((numero, str(e)))
+
+
+def lotes(filas, tamano=TAMANO_LOTE):
+    """Agrupa un generador en listas de hasta `tamano` elementos"""
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def registros_importados(filas, converter, moneda_principal):
+    """Convierte por lotes las filas validadas y genera los registros listos para agregar"""
+    for lote in lotes(filas):
+        fechas, montos, monedas = zip(*lote)
+        convertidos = converter.convert_many_at(montos, monedas, moneda_principal, fechas)
+        for fecha, monto, moneda, convertido in zip(fechas, montos, monedas, convertidos):
+            yield {
+                "fecha": fecha,
+                "monto": monto,
+                "moneda": moneda,
+                "monto_convertido": float(convertido),
+                "moneda_principal": moneda_principal,
+                "estado": estado_de(monto)
+            }
+
+
+def importar_extracto(ruta, datos, converter, moneda_principal, moneda_por_defecto="USD", progreso=None):
+    """Importa un extracto CSV u OFX al almacenamiento en una sola operación.
+
+    El archivo se lee como un flujo (línea, validación y conversión por lotes)
+    y los registros pasan directamente a `agregar_varios`, que los agrega en
+    una sola transacción y los guarda una sola vez. Devuelve (cantidad
+    importada, errores), donde cada error es (número de línea, motivo).
+    """
+    errores = []
+    with open(ruta, "rb") as archivo:
+        lineas = leer_lineas(archivo, progreso)
+        if ruta.lower().endswith((".ofx", ".qfx")):
+            filas = filas_ofx(lineas, moneda_por_defecto)
+        else:
+            filas = filas_csv(lineas, moneda_por_defecto)
+        registros = registros_importados(validar(filas, errores), converter, moneda_principal)
+        cantidad = datos.agregar_varios(registros)
+    return cantidad, errores
@@ -0,0 +1,88 @@
+import calendar
+import heapq
+from datetime import date
+
+from setup.ledger import fecha_a_ordinal
+
+
+class MesCalendario:
+    """Registros de un mes agrupados por día, con el total de cada día ya calculado"""
+
+    __slots__ = ("transacciones", "totales", "resumenes")
+
+    def __init__(self):
+        self.transacciones = {}  # día -> [(clave, monto, moneda)]
+        self.totales = {}        # día -> suma de montos
+        self.resumenes = {}      # día -> (límite, principales, cantidad restante), en caché
+
+    def agregar(self, dia, clave, monto, moneda):
+        self.transacciones.setdefault(dia, []).append((clave, monto, moneda))
+        self.totales[dia] = self.totales.get(dia, 0) + monto
+        self.resumenes.pop(dia, None)
+
+    def resumen(self, dia, limite):
+        """Las `limite` transacciones de mayor monto absoluto de un día y cuántas quedan fuera"""
+        resumen = self.resumenes.get(dia)
+        if resumen is None or resumen[0] != limite:
+            transacciones = self.transacciones.get(dia, [])
+            principales = heapq.nlargest(limite, transacciones, key=lambda t: abs(t[1]))
+            resumen = (limite, principales, len(transacciones) - len(principales))
+            self.resumenes[dia] = resumen
+        return resumen[1:]
+
+    def quitar(self, dia, clave):
+        transacciones = self.transacciones.get(dia, [])
+        for i, (clave_actual, monto, _) in enumerate(transacciones):
+            if clave_actual == clave:
+                del transacciones[i]
+                break
+        else:
+            return
+        self.resumenes.pop(dia, None)
+        if transacciones:
+            self.totales[dia] -= monto
+        else:
+            del self.transacciones[dia]
+            del self.totales[dia]
+
+
+class IndiceCalendario:
+    """Índice de registros por (año, mes) para el calendario.
+
+    Cada mes se arma la primera vez que se muestra (pidiendo al almacenamiento
+    solo ese rango de fechas) y después se mantiene con cada alta y baja, así
+    abrir el calendario o cambiar de mes solo toca los datos de ese mes.
+    """
+
+    def __init__(self, registros):
+        self.registros = registros
+        self.meses = {}
+
+    def mes(self, ano, mes):
+        """Devuelve el MesCalendario de un mes, cargándolo si hace falta"""
+        datos_mes = self.meses.get((ano, mes))
+        if datos_mes is None:
+            datos_mes = MesCalendario()
+            num_dias = calendar.monthrange(ano, mes)[1]
+            desde = f"{ano}-{mes:02d}-01"
+            hasta = f"{ano}-{mes:02d}-{num_dias:02d}"
+            for clave, registro in self.registros.items_entre(desde, hasta):
+                dia = int(registro["fecha"][8:10])
+                datos_mes.agregar(dia, clave, registro["monto"], registro["moneda"])
+            self.meses[(ano, mes)] = datos_mes
+        return datos_mes
+
+    def _mes_de(self, registro):
+        fecha = date.fromordinal(fecha_a_ordinal(registro["fecha"]))
+        return self.meses.get((fecha.year, fecha.month)), fecha.day
+
+    def alta(self, clave, registro):
+        # Los meses que todavía no se cargaron leerán el registro al cargarse
+        datos_mes, dia = self._mes_de(registro)
+        if datos_mes is not None:
+            datos_mes.agregar(dia, clave, registro["monto"], registro["moneda"])
+
+    def baja(self, clave, registro):
+        datos_mes, dia = self._mes_de(registro)
+        if datos_mes is not None:
+            datos_mes.quitar(dia, clave)
@@ -0,0 +1,281 @@
+import math
+from array import array
+from datetime import date, datetime
+
+# NumPy es opcional: si está instalado, las sumas por columna se hacen sobre
+# vistas sin copia de los arrays; si no, se usa la librería estándar
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CAMPOS = ("fecha", "monto", "moneda", "monto_convertido", "moneda_principal", "estado")
+
+# Las filas borradas quedan como "huecos" con fecha 0 y montos en 0, para que
+# las sumas por columna no necesiten máscara y las claves sigan siendo estables
+FECHA_BORRADA = 0
+
+# Filas por trozo al recorrer una columna entera sin armar una lista de todas
+TAMANO_TROZO = 65_536
+
+
+def fecha_a_ordinal(fecha):
+    """Convierte 'AAAA-MM-DD' al número de día usado en la columna de fechas"""
+    try:
+        return date.fromisoformat(fecha).toordinal()
+    except ValueError:
+        return datetime.strptime(fecha, "%Y-%m-%d").toordinal()
+
+
+def ordinal_a_fecha(ordinal):
+    return date.fromordinal(ordinal).isoformat()
+
+
+class Codigos:
+    """Tabla de códigos pequeños para valores repetidos (monedas, estados)"""
+
+    def __init__(self):
+        self.valores = []
+        self._codigo_de = {}
+
+    def codigo(self, valor):
+        codigo = self._codigo_de.get(valor)
+        if codigo is None:
+            codigo = len(self.valores)
+            if codigo > 255:
+                raise ValueError("Demasiados valores distintos para una columna de 1 byte")
+            self.valores.append(valor)
+            self._codigo_de[valor] = codigo
+        return codigo
+
+    def buscar(self, valor):
+        """Devuelve el código de un valor ya conocido, o None"""
+        return self._codigo_de.get(valor)
+
+
+class RegistroVista:
+    """Vista de solo lectura de una fila del Ledger, con acceso tipo dict"""
+
+    __slots__ = ("ledger", "clave")
+
+    def __init__(self, ledger, clave):
+        self.ledger = ledger
+        self.clave = clave
+
+    def __getitem__(self, campo):
+        valor = self.ledger.valor(self.clave, campo)
+        if valor is None and campo in ("monto_convertido", "moneda_principal"):
+            raise KeyError(campo)
+        return valor
+
+    def get(self, campo, default=None):
+        valor = self.ledger.valor(self.clave, campo)
+        return default if valor is None else valor
+
+    def __contains__(self, campo):
+        return self.get(campo) is not None
+
+    def keys(self):
+        return [campo for campo in CAMPOS if campo in self]
+
+    def a_dict(self):
+        return {campo: self[campo] for campo in self.keys()}
+
+    def __eq__(self, otro):
+        if isinstance(otro, RegistroVista):
+            otro = otro.a_dict()
+        return self.a_dict() == otro
+
+    def __repr__(self):
+        return f"RegistroVista({self.a_dict()!r})"
+
+
+class Ledger:
+    """Registros guardados por columnas en arrays compactos.
+
+    Las fechas se guardan como ordinales de día, los montos como float64 y la
+    moneda y el estado como códigos de 1 byte: cada registro ocupa ~23 bytes
+    en lugar de los cientos que cuesta un dict. La clave de un registro es su
+    posición en las columnas y no cambia mientras dure la sesión.
+    """
+
+    def __init__(self, registros=()):
+        self.fechas = array("i")
+        self.montos = array("d")
+        self.monedas = array("B")
+        self.montos_convertidos = array("d")  # NaN = todavía sin convertir
+        self.monedas_principales = array("B")
+        self.estados = array("B")
+        self.codigos_moneda = Codigos()
+        self.codigos_estado = Codigos()
+        self._borrados = 0
+        for registro in registros:
+            self._insertar(registro)
+
+    def _insertar(self, registro):
+        clave = len(self.fechas)
+        monto_convertido = registro.get("monto_convertido")
+        self.fechas.append(fecha_a_ordinal(registro["fecha"]))
+        self.montos.append(float(registro.get("monto", 0)))
+        self.monedas.append(self.codigos_moneda.codigo(registro.get("moneda", "USD")))
+        self.montos_convertidos.append(math.nan if monto_convertido is None else float(monto_convertido))
+        self.monedas_principales.append(self.codigos_moneda.codigo(registro.get("moneda_principal")))
+        self.estados.append(self.codigos_estado.codigo(registro.get("estado")))
+        return clave
+
+    def _existe(self, clave):
+        return 0 <= clave < len(self.fechas) and self.fechas[clave] != FECHA_BORRADA
+
+    def __len__(self):
+        return len(self.fechas) - self._borrados
+
+    def __iter__(self):
+        for clave in range(len(self.fechas)):
+            if self.fechas[clave] != FECHA_BORRADA:
+                yield RegistroVista(self, clave)
+
+    def __getitem__(self, clave):
+        if not self._existe(clave):
+            raise KeyError(clave)
+        return RegistroVista(self, clave)
+
+    def items(self):
+        for registro in self:
+            yield registro.clave, registro
+
+    def valor(self, clave, campo):
+        """Lee un campo de una fila, con el mismo tipo que tendría en el dict original"""
+        if campo == "fecha":
+            return ordinal_a_fecha(self.fechas[clave])
+        if campo == "monto":
+            return self.montos[clave]
+        if campo == "moneda":
+            return self.codigos_moneda.valores[self.monedas[clave]]
+        if campo == "monto_convertido":
+            monto_convertido = self.montos_convertidos[clave]
+            return None if math.isnan(monto_convertido) else monto_convertido
+        if campo == "moneda_principal":
+            return self.codigos_moneda.valores[self.monedas_principales[clave]]
+        if campo == "estado":
+            return self.codigos_estado.valores[self.estados[clave]]
+        raise KeyError(campo)
+
+    def agregar(self, registro):
+        return self._insertar(registro)
+
+    def agregar_varios(self, registros):
+        """Agrega muchos registros de una vez; si uno falla no queda ninguno. Devuelve la cantidad"""
+        inicio = len(self.fechas)
+        try:
+            for registro in registros:
+                self._insertar(registro)
+        except Exception:
+            for columna in (self.fechas, self.montos, self.monedas,
+                            self.montos_convertidos, self.monedas_principales, self.estados):
+                del columna[inicio:]
+            raise
+        return len(self.fechas) - inicio
+
+    def borrar(self, clave):
+        """Borra una fila dejando un hueco; devuelve el registro como dict"""
+        registro = self[clave].a_dict()
+        self.fechas[clave] = FECHA_BORRADA
+        self.montos[clave] = 0.0
+        self.montos_convertidos[clave] = 0.0
+        self._borrados += 1
+        return registro
+
+    def reconvertir(self, converter, moneda_principal):
+        """Recalcula toda la columna monto_convertido en otra moneda principal.
+
+        Cada fila se convierte con la tasa de su fecha, como al agregarla o
+        importarla (los huecos tienen monto 0 y siguen en 0).
+        """
+        convertidos = converter.convert_many_at(
+            self.montos, self.monedas, moneda_principal, self.fechas,
+            currency_names=self.codigos_moneda.valores
+        )
+        if np is not None:
+            self.montos_convertidos = array("d", convertidos.tobytes())
+        else:
+            self.montos_convertidos = array("d", convertidos)
+        self.monedas_principales = array("B", [self.codigos_moneda.codigo(moneda_principal)]) * len(self.fechas)
+
+    def a_dicts(self):
+        """Genera los registros como dicts, para serializarlos"""
+        for registro in self:
+            yield registro.a_dict()
+
+    # Consultas por columna
+    def claves_por_fecha(self):
+        """Claves de los registros, del más reciente al más antiguo"""
+        if np is not None:
+            fechas = np.frombuffer(self.fechas, dtype=np.int32)
+            # Orden estable: a igual fecha se respeta el orden de carga
+            claves = np.argsort(-fechas, kind="stable").tolist()
+        else:
+            claves = sorted(range(len(self.fechas)), key=self.fechas.__getitem__, reverse=True)
+        # Los huecos (fecha 0) quedan al final
+        return claves[:len(self)]
+
+    def sumas_por_moneda(self):
+        if np is not None and len(self.montos):
+            sumas = np.bincount(
+                np.frombuffer(self.monedas, dtype=np.uint8),
+                weights=np.frombuffer(self.montos, dtype=np.float64)
+            )
+            usadas = np.bincount(np.frombuffer(self.monedas, dtype=np.uint8)[self._vivos_np()])
+            return {
+                self.codigos_moneda.valores[codigo]: float(sumas[codigo])
+                for codigo in np.nonzero(usadas)[0].tolist()
+            }
+        sumas = {}
+        for codigo, monto, fecha in zip(self.monedas, self.montos, self.fechas):
+            if fecha != FECHA_BORRADA:
+                sumas[codigo] = sumas.get(codigo, 0.0) + monto
+        return {self.codigos_moneda.valores[codigo]: suma for codigo, suma in sumas.items()}
+
+    def _vivos_np(self):
+        return np.frombuffer(self.fechas, dtype=np.int32) != FECHA_BORRADA
+
+    def resumen_por_fecha(self):
+        """Genera (fecha, cantidad, suma de montos) por cada día con registros"""
+        if np is not None and len(self.fechas):
+            fechas = np.frombuffer(self.fechas, dtype=np.int32)
+            vivos = fechas != FECHA_BORRADA
+            dias, posiciones, cantidades = np.unique(fechas[vivos], return_inverse=True, return_counts=True)
+            sumas = np.bincount(posiciones, weights=np.frombuffer(self.montos, dtype=np.float64)[vivos])
+            for dia, cantidad, suma in zip(dias.tolist(), cantidades.tolist(), sumas.tolist()):
+                yield ordinal_a_fecha(dia), cantidad, suma
+            return
+        resumen = {}
+        for fecha, monto in zip(self.fechas, self.montos):
+            if fecha != FECHA_BORRADA:
+                cantidad, suma = resumen.get(fecha, (0, 0.0))
+                resumen[fecha] = (cantidad + 1, suma + monto)
+        for fecha, (cantidad, suma) in resumen.items():
+            yield ordinal_a_fecha(fecha), cantidad, suma
+
+    def claves_entre(self, desde, hasta):
+        """Genera las claves con fecha entre desde y hasta (inclusive), recorriendo las fechas por trozos"""
+        inicio = fecha_a_ordinal(desde)
+        fin = fecha_a_ordinal(hasta)
+        for primera in range(0, len(self.fechas), TAMANO_TROZO):
+            ultima = min(primera + TAMANO_TROZO, len(self.fechas))
+            if np is not None:
+                fechas = np.frombuffer(
+                    self.fechas, dtype=np.int32, count=ultima - primera, offset=primera * self.fechas.itemsize
+                )
+                # A lista antes de generar: una vista viva impediría agregar filas mientras se recorre
+                claves = (np.nonzero((fechas >= inicio) & (fechas <= fin))[0] + primera).tolist()
+                del fechas
+                yield from claves
+            else:
+                for clave in range(primera, ultima):
+                    if inicio <= self.fechas[clave] <= fin:
+                        yield clave
+
+    def items_entre(self, desde, hasta):
+        """Pares (clave, registro) con fecha entre desde y hasta (inclusive)"""
+        for clave in self.claves_entre(desde, hasta):
+            yield clave, RegistroVista(self, clave)
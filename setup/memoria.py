@@ -0,0 +1,197 @@
+import gc
+import sys
+import tracemalloc
+from array import array
+from datetime import date
+
+# Cuadros de pila que guarda tracemalloc por asignación (1 = solo la línea que asigna)
+CUADROS_TRACEMALLOC = 1
+# Líneas que se muestran en los rankings de asignaciones
+LINEAS_INFORME = 10
+
+
+def iniciar_seguimiento():
+    """Empieza a registrar asignaciones; solo se atribuye lo asignado desde este momento"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(CUADROS_TRACEMALLOC)
+
+
+def tamano_profundo(objeto, vistos=None):
+    """Bytes de un objeto y de todo lo que contiene (dicts, listas, arrays, atributos)"""
+    if vistos is None:
+        vistos = set()
+    if id(objeto) in vistos:
+        return 0
+    vistos.add(id(objeto))
+    tamano = sys.getsizeof(objeto)
+
+    if isinstance(objeto, (str, bytes, int, float, bool, array, type(None))):
+        return tamano
+    if isinstance(objeto, dict):
+        for clave, valor in objeto.items():
+            tamano += tamano_profundo(clave, vistos) + tamano_profundo(valor, vistos)
+    elif isinstance(objeto, (list, tuple, set, frozenset)):
+        for elemento in objeto:
+            tamano += tamano_profundo(elemento, vistos)
+    else:
+        if hasattr(objeto, "__dict__"):
+            tamano += tamano_profundo(vars(objeto), vistos)
+        for atributo in getattr(type(objeto), "__slots__", ()):
+            if hasattr(objeto, atributo):
+                tamano += tamano_profundo(getattr(objeto, atributo), vistos)
+    return tamano
+
+
+def estructuras_nucleo(nucleo):
+    """Pares (estructura, bytes) de los datos en memoria del núcleo"""
+    estructuras = []
+    datos = nucleo.datos
+    if hasattr(datos, "conexion"):
+        # Con SQLite los registros viven en la base: en memoria solo queda el objeto
+        estructuras.append(("datos (SQLite, en disco)", sys.getsizeof(datos)))
+    elif hasattr(datos, "mapa"):
+        # El archivo binario está mapeado: sus páginas son caché del sistema, no del proceso
+        estructuras.append(("datos (archivo binario mapeado)", tamano_profundo(
+            (datos.codigos_moneda, datos.codigos_estado)
+        )))
+    else:
+        estructuras.append(("datos (columnas del ledger)", tamano_profundo(datos)))
+    estructuras.append(("estadisticas", tamano_profundo(nucleo.estadisticas)))
+    estructuras.append(("indice_calendario", tamano_profundo(
+        nucleo.indice_calendario.meses
+    )))
+    if nucleo._converter is not None:
+        converter = nucleo._converter
+        estructuras.append(("tasas de cambio (matriz e historial)", tamano_profundo(
+            (converter.rates, converter.currencies, converter.currency_index,
+             converter.matrix, converter.historial)
+        )))
+    return estructuras
+
+
+def contar_widgets(raiz):
+    """Cantidad de widgets de Tk por clase, recorriendo todas las ventanas abiertas"""
+    conteo = {}
+    pendientes = [raiz]
+    while pendientes:
+        widget = pendientes.pop()
+        clase = widget.winfo_class()
+        conteo[clase] = conteo.get(clase, 0) + 1
+        pendientes.extend(widget.winfo_children())
+    return conteo
+
+
+def estructuras_interfaz(app):
+    """Pares (estructura, bytes) del lado Python de la interfaz y conteo de items de Tk"""
+    estructuras = [("orden_tabla", tamano_profundo(app.orden_tabla))]
+    if app.tabla_virtual:
+        estructuras.append(("caché de la tabla virtual", tamano_profundo(app.tabla_virtual._cache)))
+    # Los items del Treeview y los widgets viven en Tcl: tracemalloc no los ve, se cuentan
+    estructuras.append((f"items del Treeview ({len(app.tabla.get_children())})", None))
+    widgets = contar_widgets(app.ventana)
+    estructuras.append((f"widgets de Tk ({sum(widgets.values())})", None))
+    for clase, cantidad in sorted(widgets.items(), key=lambda par: -par[1]):
+        estructuras.append((f"  {clase}: {cantidad}", None))
+    return estructuras
+
+
+def asignaciones_por_linea(limite=LINEAS_INFORME):
+    """Las líneas de código que más memoria tienen asignada ahora (si tracemalloc está activo)"""
+    if not tracemalloc.is_tracing():
+        return []
+    estadisticas = tracemalloc.take_snapshot().filter_traces(_FILTROS).statistics("lineno")
+    return [(str(estadistica.traceback[0]), estadistica.size, estadistica.count)
+            for estadistica in estadisticas[:limite]]
+
+
+_FILTROS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+)
+
+
+class SeguimientoMemoria:
+    """Compara la memoria asignada contra una referencia para detectar crecimientos (fugas)"""
+
+    def __init__(self):
+        iniciar_seguimiento()
+        self.referencia = None
+
+    def tomar_referencia(self):
+        gc.collect()
+        self.referencia = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+
+    def crecimiento(self, limite=LINEAS_INFORME):
+        """Total de bytes que crecieron desde la referencia y las líneas que más crecieron"""
+        gc.collect()
+        actual = tracemalloc.take_snapshot().filter_traces(_FILTROS)
+        diferencias = actual.compare_to(self.referencia, "lineno")
+        total = sum(diferencia.size_diff for diferencia in diferencias)
+        lineas = [
+            (str(diferencia.traceback[0]), diferencia.size_diff, diferencia.count_diff)
+            for diferencia in diferencias[:limite]
+            if diferencia.size_diff > 0
+        ]
+        return total, lineas
+
+
+def ciclos_alta_baja(nucleo, ciclos):
+    """Agrega y borra `ciclos` registros; devuelve los bytes retenidos por ciclo.
+
+    Los ciclos corren en un núcleo descartable sobre un Ledger en memoria
+    con la misma configuración, así el almacenamiento real no se toca (ni
+    diario, ni huecos, ni rowids). Después de un alta y su baja el núcleo
+    debería quedar como estaba: lo que crezca (salvo el hueco de 23 bytes
+    que deja cada fila del ledger) es una fuga.
+    """
+    from setup.ledger import Ledger
+    from setup.nucleo import Tracker
+
+    prueba = Tracker(dict(nucleo.configuracion), datos=Ledger())
+    seguimiento = SeguimientoMemoria()
+    hoy = date.today().isoformat()
+    # Un primer ciclo fuera de la medición carga las cachés (tasas, mes del índice)
+    prueba.borrar(prueba.agregar(hoy, 1.0, "USD"))
+    prueba.indice_calendario.mes(date.today().year, date.today().month)
+    seguimiento.tomar_referencia()
+    for i in range(ciclos):
+        prueba.borrar(prueba.agregar(hoy, float(i), "USD"))
+    total, lineas = seguimiento.crecimiento()
+    return total / ciclos if ciclos else 0, lineas
+
+
+def informe(nucleo, app=None):
+    """Texto con los bytes de cada estructura y las líneas con más memoria asignada"""
+    estructuras = estructuras_nucleo(nucleo)
+    if app is not None:
+        estructuras += estructuras_interfaz(app)
+    lineas = ["Memoria por estructura:"]
+    for nombre, tamano in estructuras:
+        lineas.append(f"  {nombre:<42} {formatear_bytes(tamano) if tamano is not None else '':>12}")
+
+    asignaciones = asignaciones_por_linea()
+    if asignaciones:
+        lineas.append("")
+        lineas.append("Asignaciones vivas por línea (tracemalloc):")
+        for linea, tamano, bloques in asignaciones:
+            lineas.append(f"  {formatear_bytes(tamano):>12}  {bloques:>8} bloques  {linea}")
+    else:
+        lineas.append("")
+        lineas.append("tracemalloc no está activo: no hay asignaciones por línea")
+    return "\n".join(lineas)
+
+
+def formatear_crecimiento(total, lineas, titulo):
+    texto = [f"{titulo}: {formatear_bytes(total)}"]
+    for linea, tamano, bloques in lineas:
+        texto.append(f"  {formatear_bytes(tamano):>12}  {bloques:>+8} bloques  {linea}")
+    return "\n".join(texto)
+
+
+def formatear_bytes(cantidad):
+    for unidad in ("B", "KiB", "MiB"):
+        if abs(cantidad) < 1024:
+            return f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.1f} GiB"
@@ -0,0 +1,151 @@
+from datetime import datetime
+
+from setup.estado import abrir_registros, cargar_configuracion, guardar_configuracion
+from setup.estadisticas import Estadisticas
+from setup.indice_calendario import IndiceCalendario
+
+
+def estado_de(monto):
+    """Estado que se guarda con cada registro según el signo del monto"""
+    if monto > 0:
+        return "POSITIVO"
+    elif monto < 0:
+        return "NEGATIVO"
+    return "NEUTRO"
+
+
+class Tracker:
+    """Lógica del tracker sin interfaz gráfica: registros, estadísticas, balance e import/export.
+
+    No importa tkinter: la usan tanto la ventana (main.py) como la línea de
+    comandos (tracker.py). El conversor de monedas se crea recién cuando se
+    necesita, así los comandos que no convierten arrancan sin leer tasas.
+    """
+
+    def __init__(self, configuracion=None, app=None, datos=None):
+        self.configuracion = cargar_configuracion(app) if configuracion is None else configuracion
+        # La app (si hay) le da al conversor la ventana para descargar en segundo plano
+        self.app = app
+        self._converter = None
+        # Con `datos` se trabaja sobre otro almacenamiento (por ejemplo un Ledger en memoria)
+        self.datos = abrir_registros(self.configuracion) if datos is None else datos
+        self.estadisticas = Estadisticas.desde(self.datos)
+        self.indice_calendario = IndiceCalendario(self.datos)
+        if app is not None:
+            # Con ventana, la descarga de tasas en segundo plano empieza al arrancar
+            self.converter
+
+    @property
+    def converter(self):
+        if self._converter is None:
+            from setup.currency import CurrencyConverter
+            self._converter = CurrencyConverter(self.app)
+        return self._converter
+
+    @property
+    def moneda_principal(self):
+        return self.configuracion.get("moneda_principal", "ARS")
+
+    # Registros
+    def agregar(self, fecha, monto, moneda):
+        """Agrega un registro convertido a la moneda principal; devuelve su clave.
+
+        La fecha se valida y normaliza a AAAA-MM-DD (ValueError si no es válida).
+        """
+        fecha = datetime.strptime(fecha, "%Y-%m-%d").strftime("%Y-%m-%d")
+        monto = float(monto)
+        moneda_principal = self.moneda_principal
+
+        registro = {
+            "fecha": fecha,
+            "monto": monto,
+            "moneda": moneda,
+            # Convertir con las tasas vigentes en la fecha del registro
+            "monto_convertido": self.converter.convert_at(monto, moneda, moneda_principal, fecha),
+            "moneda_principal": moneda_principal,
+            "estado": estado_de(monto)
+        }
+
+        clave = self.datos.agregar(registro)
+        self.estadisticas.alta(self.datos[clave])
+        self.indice_calendario.alta(clave, self.datos[clave])
+        return clave
+
+    def borrar(self, clave):
+        """Borra un registro por clave y devuelve sus datos"""
+        registro = self.datos.borrar(clave)
+        self.estadisticas.baja(registro)
+        self.indice_calendario.baja(clave, registro)
+        return registro
+
+    def importar(self, ruta, moneda_por_defecto="USD", progreso=None):
+        """Importa un extracto CSV u OFX; devuelve (cantidad importada, errores)"""
+        from setup.importacion import importar_extracto
+
+        cantidad, errores = importar_extracto(
+            ruta, self.datos, self.converter, self.moneda_principal,
+            moneda_por_defecto=moneda_por_defecto, progreso=progreso
+        )
+        if cantidad:
+            # Recalcular una vez los índices en lugar de ajustar fila por fila
+            self.estadisticas = Estadisticas.desde(self.datos)
+            self.indice_calendario = IndiceCalendario(self.datos)
+        return cantidad, errores
+
+    def exportar(self, ruta, formato=None, desde=None, hasta=None, monedas=None):
+        """Exporta los registros filtrados a CSV o JSON Lines; devuelve la cantidad"""
+        from setup.exportacion import exportar
+
+        return exportar(ruta, self.datos, formato, desde, hasta, monedas)
+
+    # Balance y estadísticas
+    def actualizar_tasas(self):
+        """Descarga las tasas de cambio ahora (bloquea); devuelve si se obtuvieron"""
+        return self.converter.fetch_latest_rates()
+
+    def obtener_tasa(self, moneda_origen, moneda_destino):
+        """Tasa de cambio entre dos monedas (1 si no se conoce)"""
+        tasa = self.converter.get_rate(moneda_origen, moneda_destino)
+        return 1.0 if tasa is None else tasa
+
+    def total_transacciones(self, moneda_principal=None):
+        """Suma de todos los registros convertida a una moneda"""
+        return self.estadisticas.balance(0, self.obtener_tasa, moneda_principal or self.moneda_principal)
+
+    def balance(self, moneda_principal=None):
+        """Balance inicial configurado más todas las transacciones convertidas"""
+        balance_inicial = float(self.configuracion.get("balance_total", 0))
+        return balance_inicial + self.total_transacciones(moneda_principal)
+
+    def resumen(self):
+        """Totales del panel de estadísticas"""
+        return {
+            "total": self.estadisticas.total,
+            "registros": self.estadisticas.cantidad,
+            "promedio": self.estadisticas.promedio,
+            "dias": self.estadisticas.dias
+        }
+
+    # Configuración y guardado
+    def configurar_balance(self, balance_inicial, moneda_principal):
+        """Cambia el balance inicial y la moneda principal; devuelve True si cambió la moneda"""
+        cambio_moneda = moneda_principal != self.moneda_principal
+        self.configuracion["moneda_principal"] = moneda_principal
+        self.configuracion["balance_total"] = balance_inicial
+        guardar_configuracion(self)
+        if cambio_moneda:
+            # Reconvertir toda la columna de una vez
+            self.datos.reconvertir(self.converter, moneda_principal)
+        return cambio_moneda
+
+    def guardar(self):
+        """Guarda un snapshot completo de los datos (compacta el diario o el WAL) y la configuración"""
+        self.datos.guardar()
+        guardar_configuracion(self)
+
+    def compactar(self):
+        """Guarda y, si el almacenamiento deja huecos al borrar (binario), los quita; cambia las claves"""
+        if hasattr(self.datos, "compactar"):
+            self.datos.compactar()
+            self.indice_calendario = IndiceCalendario(self.datos)
+        self.guardar()
@@ -0,0 +1,41 @@
+def configurarRefresco(app):
+    # Vistas que se pueden refrescar, en el orden en que se ejecutan
+    app.refresco = PlanificadorRefresco(app.ventana, {
+        "tabla": app.actualizar_tabla,
+        "tabla_virtual": lambda: app.tabla_virtual and app.tabla_virtual.refrescar(),
+        "estadisticas": app.actualizar_estadisticas,
+        "balance": app.actualizar_balance_total,
+    })
+
+
+class PlanificadorRefresco:
+    """Junta los pedidos de refresco de vistas y los ejecuta una sola vez por ciclo ocioso de Tk.
+
+    Marcar una vista varias veces antes de que Tk quede ocioso (ráfagas de
+    altas, importaciones, el balance pedido por la tabla y por aplicarCambios)
+    produce un único repintado.
+    """
+
+    def __init__(self, ventana, vistas):
+        self.ventana = ventana
+        self.vistas = vistas
+        self.pendientes = set()
+        self._programado = None
+
+    def marcar(self, *nombres):
+        """Marca vistas como desactualizadas y programa el refresco si hace falta"""
+        self.pendientes.update(nombres)
+        if self._programado is None:
+            self._programado = self.ventana.after_idle(self.ejecutar)
+
+    def ejecutar(self):
+        """Refresca las vistas pendientes, cada una una sola vez"""
+        # Mientras se ejecuta, las vistas que se marquen y todavía no corrieron
+        # se resuelven en esta misma pasada
+        for nombre, funcion in self.vistas.items():
+            if nombre in self.pendientes:
+                self.pendientes.discard(nombre)
+                funcion()
+        self._programado = None
+        if self.pendientes:
+            self._programado = self.ventana.after_idle(self.ejecutar)
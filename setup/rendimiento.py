@@ -0,0 +1,112 @@
+import atexit
+import functools
+import json
+import time
+from array import array
+from datetime import datetime
+
+# Duraciones que se guardan por operación (las más viejas se pisan)
+CAPACIDAD_ANILLO = 256
+
+_activo = False
+_archivo_log = None
+# Nombre de la operación -> AnilloTiempos
+MEDICIONES = {}
+
+
+class AnilloTiempos:
+    """Últimas duraciones de una operación en un buffer circular de tamaño fijo"""
+
+    __slots__ = ("tiempos", "posicion", "llamadas", "maximo")
+
+    def __init__(self, capacidad=CAPACIDAD_ANILLO):
+        self.tiempos = array("d", bytes(8 * capacidad))
+        self.posicion = 0
+        self.llamadas = 0
+        self.maximo = 0.0  # el mayor de todas las llamadas medidas (no se reinicia), aunque ya no esté en el anillo
+
+    def agregar(self, segundos):
+        self.tiempos[self.posicion] = segundos
+        self.posicion = (self.posicion + 1) % len(self.tiempos)
+        self.llamadas += 1
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def resumen(self):
+        """p50, p95 y máximo en milisegundos de las duraciones guardadas"""
+        cantidad = min(self.llamadas, len(self.tiempos))
+        if not cantidad:
+            return None
+        ordenados = sorted(self.tiempos[:cantidad])
+        return {
+            "llamadas": self.llamadas,
+            "p50": ordenados[(cantidad - 1) * 50 // 100] * 1000,
+            "p95": ordenados[(cantidad - 1) * 95 // 100] * 1000,
+            "max": self.maximo * 1000
+        }
+
+
+def anillo(nombre):
+    medicion = MEDICIONES.get(nombre)
+    if medicion is None:
+        medicion = MEDICIONES[nombre] = AnilloTiempos()
+    return medicion
+
+
+def activo():
+    return _activo
+
+
+def activar(archivo_log=None):
+    """Empieza a medir; con `archivo_log` se agrega un resumen a ese archivo al salir"""
+    global _activo, _archivo_log
+    _activo = True
+    if archivo_log and _archivo_log is None:
+        _archivo_log = archivo_log
+        atexit.register(escribir_log)
+
+
+def desactivar():
+    global _activo
+    _activo = False
+
+
+def medido(nombre):
+    """Decorador que guarda la duración de cada llamada; desactivado solo cuesta un if"""
+    def decorador(funcion):
+        medicion = anillo(nombre)
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                medicion.agregar(time.perf_counter() - inicio)
+
+        return envoltura
+    return decorador
+
+
+def resumen():
+    """Resumen de cada operación medida al menos una vez, ordenado por nombre"""
+    resultado = {}
+    for nombre in sorted(MEDICIONES):
+        datos = MEDICIONES[nombre].resumen()
+        if datos is not None:
+            resultado[nombre] = datos
+    return resultado
+
+
+def escribir_log():
+    """Agrega una línea JSON con el resumen actual al archivo de --perf-log"""
+    if _archivo_log is None:
+        return
+    linea = {"fecha": datetime.now().isoformat(timespec="seconds"), "operaciones": resumen()}
+    try:
+        with open(_archivo_log, "a", encoding="utf-8") as archivo:
+            archivo.write(json.dumps(linea) + "\n")
+    except OSError as e:
+        print(f"Error escribiendo el log de rendimiento: {e}")
@@ -0,0 +1,88 @@
+# A partir de esta cantidad de registros la tabla pasa a modo virtual (si la
+# configuración está en "auto"): Tk se vuelve lento con cientos de miles de items
+UMBRAL_TABLA_VIRTUAL = 20000
+
+
+def usar_tabla_virtual(configuracion, cantidad_registros):
+    """Decide si la tabla de registros se muestra en modo virtual"""
+    modo = configuracion.get("tabla_virtual", "auto")
+    if modo == "auto":
+        return cantidad_registros > UMBRAL_TABLA_VIRTUAL
+    return bool(modo)
+
+
+class TablaVirtual:
+    """Muestra en un ttk.Treeview solo la ventana visible de un índice ordenado.
+
+    El Treeview nunca tiene más items que filas visibles: la barra de
+    desplazamiento se calcula con la cantidad total de filas y las filas se
+    piden a `obtener_fila(posicion)` a medida que se desplaza. Se guarda en
+    caché un margen de filas alrededor de la ventana para que los pasos
+    cortos no vuelvan a consultar el almacenamiento.
+    """
+
+    def __init__(self, tabla, scrollbar, cantidad_filas, obtener_fila, visibles=15, margen=15):
+        self.tabla = tabla
+        self.scrollbar = scrollbar
+        self.cantidad_filas = cantidad_filas
+        self.obtener_fila = obtener_fila
+        self.visibles = visibles
+        self.margen = margen
+        self.inicio = 0
+        self._cache = {}
+
+        scrollbar.configure(command=self.desplazar)
+        tabla.bind("<MouseWheel>", self._rueda)
+        tabla.bind("<Button-4>", lambda e: self.mostrar_desde(self.inicio - 3))
+        tabla.bind("<Button-5>", lambda e: self.mostrar_desde(self.inicio + 3))
+        tabla.bind("<Prior>", lambda e: self.mostrar_desde(self.inicio - self.visibles))
+        tabla.bind("<Next>", lambda e: self.mostrar_desde(self.inicio + self.visibles))
+
+    def _rueda(self, event):
+        # En Windows delta es múltiplo de 120; en macOS son pasos pequeños
+        pasos = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        self.mostrar_desde(self.inicio + pasos * 3)
+        return "break"
+
+    def desplazar(self, accion, valor, unidad=None):
+        """Recibe los comandos de la barra de desplazamiento (moveto / scroll)"""
+        if accion == "moveto":
+            inicio = int(float(valor) * self.cantidad_filas())
+        else:
+            paso = self.visibles if unidad == "pages" else 1
+            inicio = self.inicio + int(valor) * paso
+        self.mostrar_desde(inicio)
+
+    def _fila(self, posicion):
+        fila = self._cache.get(posicion)
+        if fila is None:
+            # Fuera de la caché: traer la ventana nueva con su margen
+            desde = max(0, posicion - self.margen)
+            hasta = min(self.cantidad_filas(), posicion + self.visibles + self.margen)
+            self._cache = {p: self.obtener_fila(p) for p in range(desde, hasta)}
+            fila = self._cache[posicion]
+        return fila
+
+    def mostrar_desde(self, inicio):
+        """Materializa las filas visibles a partir de una posición"""
+        total = self.cantidad_filas()
+        inicio = max(0, min(inicio, total - self.visibles))
+        fin = min(total, inicio + self.visibles)
+        self.inicio = inicio
+
+        seleccion = self.tabla.selection()
+        self.tabla.delete(*self.tabla.get_children())
+        for posicion in range(inicio, fin):
+            iid, valores, tags = self._fila(posicion)
+            self.tabla.insert("", "end", iid=iid, values=valores, tags=tags)
+        self.tabla.selection_set([iid for iid in seleccion if self.tabla.exists(iid)])
+
+        if total:
+            self.scrollbar.set(inicio / total, fin / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def refrescar(self):
+        """Vuelve a pedir las filas visibles (después de un alta o una baja)"""
+        self._cache = {}
+        self.mostrar_desde(self.inicio)
@@ -1,10 +1,19 @@
 import tkinter as tk
 from tkinter import ttk, font, messagebox
 from datetime import datetime
+from array import array
+
+from setup.tabla_virtual import TablaVirtual, usar_tabla_virtual
+
+# Cantidad de monedas que se muestran como botones; el resto va en el desplegable
+MONEDAS_RAPIDAS = 3
 
 def crear_interfaz(self):
     """Crea todos los elementos de la interfaz con diseño moderno"""
     
+    # Barra de menú
+    crear_menu(self)
+    
     # Frame principal con gradiente visual
     main_container = tk.Frame(self.ventana, bg=self.color_fondo)
     main_container.pack(fill="both", expand=True, padx=0, pady=0)
@@ -182,35 +191,8 @@ def crear_interfaz(self):
     
     self.moneda_var = tk.StringVar(value="USD")
     
-    # Frame para botones de radio - SOLO LAS 3 MONEDAS
-    radio_frame = tk.Frame(moneda_frame, bg=self.color_fondo_secundario)
-    radio_frame.pack(side="left", fill="x", expand=True, padx=(10, 0))
-    
-    # SOLO USD, ARS, EUR
-    monedas_a_mostrar = [
-        ("USD", "💵 USD"),
-        ("ARS", "🇦🇷 ARS"), 
-        ("EUR", "💶 EUR")
-    ]
-    
-    for moneda, texto in monedas_a_mostrar:
-        btn = tk.Radiobutton(
-            radio_frame,
-            text=texto,
-            variable=self.moneda_var,
-            value=moneda,
-            font=("Segoe UI", 10),
-            fg=self.color_texto_secundario,
-            bg=self.color_fondo_secundario,
-            selectcolor=self.color_fondo_secundario,
-            activebackground=self.color_fondo_secundario,
-            activeforeground=self.color_acento,
-            indicatoron=0,
-            width=8,
-            relief="raised",
-            borderwidth=1
-        )
-        btn.pack(side="left", padx=(0, 10))
+    # Botones de radio para las monedas principales y un desplegable con todas
+    crear_selector_moneda(self, moneda_frame, self.moneda_var, self.color_fondo_secundario, ancho=8)
     
     # Botones de acción
     botones_frame = tk.Frame(panel_entrada, bg=self.color_fondo_secundario)
@@ -320,17 +302,107 @@ def crear_interfaz(self):
         orient="vertical",
         command=self.tabla.yview
     )
+    
+    # Con ledgers muy grandes la tabla solo materializa las filas visibles
+    self.scrollbar_tabla = scrollbar
+    self.tabla_virtual = None
     self.tabla.configure(yscrollcommand=scrollbar.set)
+    configurar_tabla_virtual(self)
+    
+    # Colores de las filas (se configuran una sola vez)
+    self.tabla.tag_configure("positivo", foreground=self.color_positivo)
+    self.tabla.tag_configure("negativo", foreground=self.color_negativo)
+    self.tabla.tag_configure("neutro", foreground=self.color_neutro)
     
     # Posicionar elementos
     self.tabla.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
     
-    # Cargar datos en la tabla
-    self.actualizar_tabla()
+    # Cargar datos en la tabla cuando Tk quede ocioso: la ventana se muestra antes
+    self.orden_tabla = array("q")
+    self.refresco.marcar("tabla")
     
     # Estadísticas
     self.crear_estadisticas()
     
-    # Actualizar balance total
-    self.actualizar_balance_total()
+    # Actualizar balance total (una sola vez, cuando Tk quede ocioso)
+    self.refresco.marcar("balance")
+
+
+def crear_menu(self):
+    """Barra de menú de la ventana principal"""
+    barra_menu = tk.Menu(self.ventana)
+    
+    self.menu_archivo = tk.Menu(barra_menu, tearoff=0)
+    self.menu_archivo.add_command(label="📥 Importar extracto (CSV/OFX)...", command=self.importar_archivo)
+    self.menu_archivo.add_command(label="📤 Exportar registros (CSV/JSONL)...", command=self.mostrar_exportacion)
+    if hasattr(self.datos, "cargar_todos"):
+        # Con un archivo por año la tabla empieza con los años recientes
+        self.menu_archivo.add_command(label="🗂️ Cargar años anteriores", command=self.datos.cargar_todos)
+    self.menu_archivo.add_separator()
+    self.menu_archivo.add_command(label="Salir", command=self.ventana.destroy)
+    barra_menu.add_cascade(label="Archivo", menu=self.menu_archivo)
+    
+    menu_diagnostico = tk.Menu(barra_menu, tearoff=0)
+    menu_diagnostico.add_command(label="⏱️ Rendimiento... (Ctrl+Shift+D)", command=self.mostrar_diagnostico)
+    menu_diagnostico.add_command(label="🧠 Memoria...", command=self.mostrar_memoria)
+    barra_menu.add_cascade(label="Diagnóstico", menu=menu_diagnostico)
+    
+    self.ventana.config(menu=barra_menu)
+    
+    # Ventana oculta de diagnóstico de rendimiento (Ctrl+Shift+D)
+    self.ventana.bind("<Control-D>", self.mostrar_diagnostico)
+
+
+def configurar_tabla_virtual(self):
+    """Pasa la tabla a modo virtual si la cantidad de registros lo pide (al crearla o tras importar)"""
+    if self.tabla_virtual or not usar_tabla_virtual(self.configuracion, len(self.datos)):
+        return
+    # La barra de desplazamiento pasa a seguir a la tabla virtual, no al Treeview
+    self.tabla.configure(yscrollcommand="")
+    self.tabla_virtual = TablaVirtual(
+        self.tabla,
+        self.scrollbar_tabla,
+        cantidad_filas=lambda: len(self.orden_tabla),
+        obtener_fila=self.fila_tabla,
+        visibles=15
+    )
+
+
+def crear_selector_moneda(self, padre, variable, bg, ancho):
+    """Botones de radio con las primeras monedas de get_all_currencies y un desplegable con todas"""
+    radio_frame = tk.Frame(padre, bg=bg)
+    radio_frame.pack(side="left", fill="x", expand=True, padx=(10, 0))
+    
+    monedas = self.converter.get_all_currencies()
+    for moneda in monedas[:MONEDAS_RAPIDAS]:
+        btn = tk.Radiobutton(
+            radio_frame,
+            text=f"{self.obtener_emoji_moneda(moneda)} {moneda}",
+            variable=variable,
+            value=moneda,
+            font=("Segoe UI", 10),
+            fg=self.color_texto_secundario,
+            bg=bg,
+            selectcolor=bg,
+            activebackground=bg,
+            activeforeground=self.color_acento,
+            indicatoron=0,
+            width=ancho,
+            relief="raised",
+            borderwidth=1
+        )
+        btn.pack(side="left", padx=(0, 10))
+    
+    # Las tasas pueden llegar después de crear la ventana: la lista se arma al abrirla
+    desplegable = ttk.Combobox(
+        radio_frame,
+        textvariable=variable,
+        values=monedas,
+        state="readonly",
+        width=6
+    )
+    desplegable.configure(postcommand=lambda: desplegable.configure(values=self.converter.get_all_currencies()))
+    desplegable.pack(side="left")
+    return radio_frame
+
@@ -3,7 +3,14 @@ import tkinter as tk
 def configurarVentana(app):
     app.ventana = tk.Tk()
     app.ventana.title("💰 Tracker Financiero Personal")
-    app.ventana.state("zoomed") 
+    try:
+        app.ventana.state("zoomed")
+    except tk.TclError:
+        # En Linux (X11) "zoomed" no es un estado válido: se maximiza con el atributo
+        try:
+            app.ventana.attributes("-zoomed", True)
+        except tk.TclError:
+            pass
     app.ventana.configure(bg="#121212")
     
     # Hacer la ventana un poco responsiva
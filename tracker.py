@@ -0,0 +1,150 @@
+"""Tracker financiero por línea de comandos (sin Tkinter).
+
+    python -m tracker agregar 2024-05-01 -1500 --moneda ARS
+    python -m tracker balance [--moneda USD]
+    python -m tracker estadisticas
+    python -m tracker importar extracto.csv
+    python -m tracker exportar salida.csv --desde 2024-01-01 --moneda USD
+    python -m tracker compactar
+    python -m tracker memoria [--ciclos 1000]
+    python -m tracker convertir datos.json datos.ledger
+    python -m tracker --actualizar-tasas balance
+
+Usa los mismos archivos (config.json, datos.json / datos.db) que la ventana.
+Las tasas de cambio salen de la caché (o de las de respaldo) sin esperar a la
+red; --actualizar-tasas las descarga antes de ejecutar el comando.
+"""
+import argparse
+import sys
+
+from setup.nucleo import Tracker
+
+
+def comando_agregar(tracker, opciones):
+    clave = tracker.agregar(opciones.fecha, opciones.monto, opciones.moneda.upper())
+    registro = tracker.datos[clave]
+    print(f"Agregado: {registro['fecha']} {registro['monto']:+.2f} {registro['moneda']} "
+          f"({registro['monto_convertido']:+.2f} {registro['moneda_principal']})")
+
+
+def comando_balance(tracker, opciones):
+    moneda = (opciones.moneda or tracker.moneda_principal).upper()
+    print(f"Balance: {tracker.balance(moneda):+,.2f} {moneda}")
+
+
+def comando_estadisticas(tracker, opciones):
+    resumen = tracker.resumen()
+    print(f"Total:     {resumen['total']:+,.2f}")
+    print(f"Registros: {resumen['registros']}")
+    print(f"Promedio:  {resumen['promedio']:+,.2f}")
+    print(f"Días:      {resumen['dias']}")
+
+
+def comando_importar(tracker, opciones):
+    cantidad, errores = tracker.importar(opciones.archivo, moneda_por_defecto=opciones.moneda.upper())
+    print(f"Importados {cantidad} registros de {opciones.archivo}")
+    for numero, motivo in errores:
+        print(f"  Línea {numero} omitida: {motivo}", file=sys.stderr)
+
+
+def comando_exportar(tracker, opciones):
+    monedas = [moneda.upper() for moneda in opciones.monedas] if opciones.monedas else None
+    cantidad = tracker.exportar(opciones.salida, opciones.formato, opciones.desde, opciones.hasta, monedas)
+    print(f"Exportados {cantidad} registros a {opciones.salida}")
+
+
+def comando_compactar(tracker, opciones):
+    tracker.compactar()
+    print(f"Datos compactados ({len(tracker.datos)} registros)")
+
+
+def comando_memoria(tracker, opciones):
+    from setup.memoria import ciclos_alta_baja, formatear_crecimiento, informe
+
+    print(informe(tracker))
+    if opciones.ciclos:
+        por_ciclo, lineas = ciclos_alta_baja(tracker, opciones.ciclos)
+        print()
+        print(formatear_crecimiento(por_ciclo, lineas, f"Retenido por ciclo de alta y baja ({opciones.ciclos} ciclos)"))
+
+
+def comando_convertir(tracker, opciones):
+    from setup.almacen_binario import binario_a_json, json_a_binario
+
+    if opciones.origen.lower().endswith(".json"):
+        cantidad = json_a_binario(opciones.origen, opciones.destino)
+    elif opciones.destino.lower().endswith(".json"):
+        cantidad = binario_a_json(opciones.origen, opciones.destino)
+    else:
+        raise ValueError("Uno de los dos archivos tiene que ser .json")
+    print(f"Convertidos {cantidad} registros de {opciones.origen} a {opciones.destino}")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog="tracker", description="Tracker financiero sin interfaz gráfica")
+    parser.add_argument("--actualizar-tasas", action="store_true",
+                        help="descarga las tasas de cambio antes del comando (si no, usa las guardadas)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    agregar = comandos.add_parser("agregar", aliases=["add"], help="agrega un registro")
+    agregar.add_argument("fecha", help="AAAA-MM-DD")
+    agregar.add_argument("monto", type=float)
+    agregar.add_argument("--moneda", default="USD")
+    agregar.set_defaults(funcion=comando_agregar)
+
+    balance = comandos.add_parser("balance", help="balance inicial más las transacciones")
+    balance.add_argument("--moneda", help="por defecto, la moneda principal configurada")
+    balance.set_defaults(funcion=comando_balance)
+
+    estadisticas = comandos.add_parser("estadisticas", aliases=["stats"], help="totales de los registros")
+    estadisticas.set_defaults(funcion=comando_estadisticas)
+
+    importar = comandos.add_parser("importar", aliases=["import"], help="importa un extracto CSV u OFX")
+    importar.add_argument("archivo")
+    importar.add_argument("--moneda", default="USD", help="moneda de las filas que no la indican")
+    importar.set_defaults(funcion=comando_importar)
+
+    exportar = comandos.add_parser("exportar", aliases=["export"], help="exporta a CSV o JSON Lines")
+    exportar.add_argument("salida", help="archivo de destino (.csv o .jsonl)")
+    exportar.add_argument("--formato", choices=("csv", "jsonl"), help="por defecto, según la extensión")
+    exportar.add_argument("--desde", help="fecha inicial AAAA-MM-DD (inclusive)")
+    exportar.add_argument("--hasta", help="fecha final AAAA-MM-DD (inclusive)")
+    exportar.add_argument("--moneda", action="append", dest="monedas", help="se puede repetir")
+    exportar.set_defaults(funcion=comando_exportar)
+
+    compactar = comandos.add_parser("compactar", help="reescribe el snapshot y vacía el diario (en binario, quita los huecos)")
+    compactar.set_defaults(funcion=comando_compactar)
+
+    memoria = comandos.add_parser("memoria", aliases=["memory"], help="informe de memoria por estructura")
+    memoria.add_argument("--ciclos", type=int, default=0,
+                         help="agrega y borra N registros para detectar memoria retenida (sin tocar los datos)")
+    # tracemalloc tiene que estar activo antes de cargar los datos para atribuirlos
+    memoria.set_defaults(funcion=comando_memoria, seguir_memoria=True)
+
+    convertir = comandos.add_parser("convertir", aliases=["convert"],
+                                    help="convierte entre datos.json y el formato binario (.ledger)")
+    convertir.add_argument("origen")
+    convertir.add_argument("destino")
+    # Trabaja con los archivos indicados, no con los datos configurados
+    convertir.set_defaults(funcion=comando_convertir, sin_datos=True)
+    return parser
+
+
+def main(argumentos=None):
+    opciones = crear_parser().parse_args(argumentos)
+    if getattr(opciones, "seguir_memoria", False):
+        from setup.memoria import iniciar_seguimiento
+        iniciar_seguimiento()
+    try:
+        tracker = None if getattr(opciones, "sin_datos", False) else Tracker()
+        if opciones.actualizar_tasas and tracker is not None:
+            tracker.actualizar_tasas()
+        opciones.funcion(tracker, opciones)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())